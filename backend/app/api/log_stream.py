@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from app.core.settings import settings
+from app.db.session import SessionLocal
+
+TERMINAL_STATUSES = {"success", "failed"}
+STREAM_BATCH_SIZE = 200
+STREAM_RETRY_MS = 3000
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def parse_last_event_id(value: str | None) -> int | None:
+    if not value:
+        return None
+    try:
+        return max(int(value.strip()), 0)
+    except ValueError:
+        return None
+
+
+def _format_event(event: str, data: dict[str, Any], event_id: int | None = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _poll_job(job_model, log_model, log_schema, job_id: int, after_id: int):
+    with SessionLocal() as db:
+        job = (
+            db.query(job_model.status, job_model.attempts, job_model.error_message, job_model.updated_at)
+            .filter(job_model.id == job_id)
+            .first()
+        )
+        rows = (
+            db.query(log_model)
+            .filter(log_model.job_id == job_id, log_model.id > after_id)
+            .order_by(log_model.id.asc())
+            .limit(STREAM_BATCH_SIZE)
+            .all()
+        )
+        logs = [log_schema.model_validate(row).model_dump(mode="json") for row in rows]
+
+    if job is None:
+        return None, logs
+    status = {
+        "status": job.status,
+        "attempts": job.attempts,
+        "error_message": job.error_message,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+    return status, logs
+
+
+async def stream_job_events(
+    request: Request,
+    job_model,
+    log_model,
+    log_schema,
+    job_id: int,
+    after_id: int | None,
+) -> AsyncIterator[str]:
+    """Emite eventos SSE `log`, `status` e `end` acompanhando o id do ultimo log enviado."""
+    last_id = after_id or 0
+    last_status: dict[str, Any] | None = None
+    idle_seconds = 0.0
+    poll_seconds = max(settings.log_stream_poll_seconds, 0.1)
+
+    yield f"retry: {STREAM_RETRY_MS}\n\n"
+    while True:
+        if await request.is_disconnected():
+            return
+
+        status, logs = await run_in_threadpool(_poll_job, job_model, log_model, log_schema, job_id, last_id)
+        for log in logs:
+            last_id = log["id"]
+            yield _format_event("log", log, event_id=last_id)
+
+        if status is None:
+            yield _format_event("end", {"reason": "job_not_found"})
+            return
+        if status != last_status:
+            last_status = status
+            yield _format_event("status", status)
+
+        if len(logs) >= STREAM_BATCH_SIZE:
+            continue
+        if status["status"] in TERMINAL_STATUSES:
+            yield _format_event("end", {"reason": status["status"]}, event_id=last_id)
+            return
+
+        await asyncio.sleep(poll_seconds)
+        idle_seconds = 0.0 if logs else idle_seconds + poll_seconds
+        if idle_seconds >= settings.log_stream_heartbeat_seconds:
+            idle_seconds = 0.0
+            yield ": ping\n\n"
@@ -1,26 +1,44 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import hmac
+from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from sqlalchemy import func, inspect, select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
-
-from app.core.auth import create_access_token, hash_password, hash_token, token_expires_at, verify_password
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.api.log_stream import SSE_HEADERS, parse_last_event_id, stream_job_events
+from app.core.auth import (
+    create_access_token,
+    create_stream_token,
+    hash_password,
+    hash_token,
+    token_expires_at,
+    verify_password,
+    verify_stream_token,
+)
+from app.core.auth_cache import auth_token_cache
 from app.core.security import build_fernet, encrypt_text
 from app.core.settings import settings
-from app.db.session import get_db
+from app.db.async_session import async_engine, get_async_db
+from app.db.session import SessionLocal, engine, get_db
 from app.models.models import (
     AuthToken,
     GitHubAccount,
     GitHubRepository,
     Job,
+    JobLog,
     LeetCodeCompletedProblem,
     LeetCodeJob,
     LeetCodeJobLog,
     LeetCodeSchedule,
     LeetCodeScheduleRun,
     LinkedinAccount,
+    LLMCall,
     Schedule,
     ScheduleRun,
     User,
@@ -39,8 +57,11 @@ from app.schemas.schemas import (
     GitHubRepositoryCreate,
     GitHubRepositoryOut,
     GitHubRepositoryUpdate,
+    JobDetailOut,
+    JobLogOut,
     JobOut,
     LeetCodeCompletedOut,
+    LeetCodeJobDetailOut,
     LeetCodeJobLogOut,
     LeetCodeJobOut,
     LeetCodePromptSettingsOut,
@@ -49,6 +70,9 @@ from app.schemas.schemas import (
     LeetCodeScheduleCreate,
     LeetCodeScheduleOut,
     LeetCodeScheduleUpdate,
+    LLMCallOut,
+    LLMUsageSummaryOut,
+    LogStreamTokenOut,
     ManualJobCreate,
     OpenAIKeyUpdate,
     ScheduleCreate,
@@ -61,6 +85,7 @@ from packages.leetcode_automation.prompts import PROMPT_GENERATE_SOLUTION
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = 500
 SELECTION_STRATEGIES = {"random", "easy_first", "sequential"}
 DIFFICULTY_POLICIES = {"random", "easy", "medium", "hard"}
 LEGACY_DIFFICULTY_POLICY_MAP = {
@@ -128,28 +153,129 @@ def get_current_user(
     db: Session = Depends(get_db),
     authorization: str | None = Header(default=None),
 ) -> User:
+    return _authenticate_user(db, authorization)
+
+
+def _authenticate_user(db: Session, authorization: str | None) -> User:
     token_value = _extract_bearer_token(authorization)
-    token = (
-        db.query(AuthToken)
-        .filter(
-            AuthToken.token_hash == hash_token(token_value),
-            AuthToken.revoked.is_(False),
-            AuthToken.expires_at > datetime.now(UTC).replace(tzinfo=None),
-        )
-        .first()
+    token_hash = hash_token(token_value)
+    now = datetime.now(UTC).replace(tzinfo=None)
+
+    cached = auth_token_cache.get(token_hash, now)
+    if cached:
+        user = _attach_cached_user(db, cached.user_state)
+        token_id = cached.token_id
+    else:
+        token = db.scalars(_active_token_query(token_hash, now)).first()
+        if not token:
+            raise HTTPException(status_code=401, detail="Token invalido ou expirado.")
+
+        user = db.scalars(_active_user_query(token.user_id)).first()
+        if not user:
+            raise HTTPException(status_code=401, detail="Usuario invalido ou inativo.")
+
+        token_id = token.id
+        auth_token_cache.put(token_hash, token.id, user.id, token.expires_at, _user_state(user))
+
+    due = auth_token_cache.touch(token_id)
+    if due:
+        # Conexao propria: a sessao da request continua somente leitura.
+        with engine.begin() as conn:
+            conn.execute(_touch_tokens_query(due, now))
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    authorization: str | None = Header(default=None),
+) -> User:
+    token_value = _extract_bearer_token(authorization)
+    token_hash = hash_token(token_value)
+    now = datetime.now(UTC).replace(tzinfo=None)
+
+    cached = auth_token_cache.get(token_hash, now)
+    if cached:
+        # Snapshot somente leitura, fora da sessao; use nas rotas async que apenas consultam.
+        user = User(**cached.user_state)
+        token_id = cached.token_id
+    else:
+        token = (await db.scalars(_active_token_query(token_hash, now))).first()
+        if not token:
+            raise HTTPException(status_code=401, detail="Token invalido ou expirado.")
+
+        user = (await db.scalars(_active_user_query(token.user_id))).first()
+        if not user:
+            raise HTTPException(status_code=401, detail="Usuario invalido ou inativo.")
+
+        token_id = token.id
+        auth_token_cache.put(token_hash, token.id, user.id, token.expires_at, _user_state(user))
+
+    due = auth_token_cache.touch(token_id)
+    if due:
+        async with async_engine.begin() as conn:
+            await conn.execute(_touch_tokens_query(due, now))
+    return user
+
+
+def _active_token_query(token_hash: str, now: datetime):
+    return select(AuthToken).where(
+        AuthToken.token_hash == token_hash,
+        AuthToken.revoked.is_(False),
+        AuthToken.expires_at > now,
     )
-    if not token:
-        raise HTTPException(status_code=401, detail="Token invalido ou expirado.")
 
-    user = db.query(User).filter(User.id == token.user_id, User.is_active.is_(True)).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="Usuario invalido ou inativo.")
 
-    token.last_used_at = datetime.now(UTC).replace(tzinfo=None)
-    db.commit()
+def _active_user_query(user_id: int):
+    return select(User).where(User.id == user_id, User.is_active.is_(True))
+
+
+def _touch_tokens_query(token_ids: list[int], now: datetime):
+    return update(AuthToken).where(AuthToken.id.in_(token_ids)).values(last_used_at=now)
+
+
+def _user_state(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+def _attach_cached_user(db: Session, user_state: dict) -> User:
+    # Reanexa o snapshot como objeto persistente sem SELECT; alteracoes nas rotas seguem com UPDATE normal.
+    existing = db.identity_map.get((User, (user_state["id"],), None))
+    if existing is not None:
+        return existing
+    user = User(**user_state)
+    make_transient_to_detached(user)
+    db.add(user)
     return user
 
 
+def _stream_secret() -> str:
+    if not settings.token_encryption_key.strip():
+        raise HTTPException(status_code=500, detail="TOKEN_ENCRYPTION_KEY nao configurada para assinar tokens de stream.")
+    return settings.token_encryption_key
+
+
+def _stream_token_response(current_user: User, scope: str, job_id: int) -> LogStreamTokenOut:
+    ttl = settings.log_stream_token_ttl_seconds
+    token = create_stream_token(_stream_secret(), current_user.id, scope, job_id, ttl)
+    return LogStreamTokenOut(stream_token=token, expires_in=ttl)
+
+
+def _stream_user_id(
+    db: Session,
+    scope: str,
+    job_id: int,
+    stream_token: str | None,
+    authorization: str | None,
+) -> int:
+    """Usuario do stream: token assinado da query string (EventSource) ou Bearer no header (curl, fetch)."""
+    if stream_token:
+        user_id = verify_stream_token(_stream_secret(), stream_token, scope, job_id)
+        if user_id is None:
+            raise HTTPException(status_code=401, detail="Token de stream invalido ou expirado.")
+        return user_id
+    return _authenticate_user(db, authorization).id
+
+
 def _build_auth_response(db: Session, user: User) -> AuthTokenOut:
     raw_token = create_access_token()
     token = AuthToken(
@@ -164,11 +290,55 @@ def _build_auth_response(db: Session, user: User) -> AuthTokenOut:
     return AuthTokenOut(access_token=raw_token, user=AuthUserOut.model_validate(user))
 
 
+async def _keyset_page(
+    db: AsyncSession,
+    query,
+    id_column,
+    limit: int,
+    before: int | None,
+    after: int | None,
+    descending: bool = True,
+):
+    if before is not None:
+        query = query.filter(id_column < before)
+    if after is not None:
+        query = query.filter(id_column > after)
+    # Busca as linhas mais proximas do cursor e devolve na ordem natural da listagem.
+    if descending:
+        reverse = after is not None and before is None
+    else:
+        reverse = before is not None and after is None
+    fetch_desc = descending != reverse
+    query = query.order_by(id_column.desc() if fetch_desc else id_column.asc()).limit(limit)
+    rows = list((await db.scalars(query)).all())
+    if reverse:
+        rows.reverse()
+    return rows
+
+
+def _filter_created_range(query, created_column, created_from: datetime | None, created_to: datetime | None):
+    if created_from is not None:
+        query = query.filter(created_column >= created_from)
+    if created_to is not None:
+        query = query.filter(created_column < created_to)
+    return query
+
+
 @router.get("/health")
-def healthcheck():
+async def healthcheck():
     return {"status": "ok", "service": "autofeedr-api"}
 
 
+@router.get("/metrics", include_in_schema=False)
+def metrics(authorization: str | None = Header(default=None)):
+    # Sem METRICS_TOKEN a rota fica desligada no router publico; o scraper envia `Authorization: Bearer <token>`.
+    if not settings.metrics_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(_extract_bearer_token(authorization), settings.metrics_token):
+        raise HTTPException(status_code=401, detail="Token de metricas invalido.")
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @router.post("/auth/register", response_model=AuthTokenOut)
 def auth_register(payload: AuthRegister, db: Session = Depends(get_db)):
     email = payload.email.strip().lower()
@@ -198,10 +368,12 @@ def auth_logout(
     authorization: str | None = Header(default=None),
 ):
     token_value = _extract_bearer_token(authorization)
-    token = db.query(AuthToken).filter(AuthToken.token_hash == hash_token(token_value)).first()
+    token_hash = hash_token(token_value)
+    token = db.query(AuthToken).filter(AuthToken.token_hash == token_hash).first()
     if token:
         token.revoked = True
         db.commit()
+    auth_token_cache.invalidate_token(token_hash)
     return {"ok": True}
 
 
@@ -224,6 +396,7 @@ def auth_set_openai_key(
     fernet = _fernet_or_500()
     current_user.openai_api_key_encrypted = encrypt_text(fernet, payload.api_key.strip())
     db.commit()
+    auth_token_cache.invalidate_user(current_user.id)
     db.refresh(current_user)
     return {"ok": True, "has_openai_api_key": current_user.has_openai_api_key}
 
@@ -250,6 +423,7 @@ def update_leetcode_prompts(
 ):
     current_user.leetcode_solution_prompt = payload.solution_prompt
     db.commit()
+    auth_token_cache.invalidate_user(current_user.id)
     db.refresh(current_user)
     return {"solution_prompt": current_user.leetcode_solution_prompt}
 
@@ -509,6 +683,7 @@ def publish_now(
         paper_text=payload.paper_text,
         max_attempts=settings.worker_max_attempts,
         scheduled_for=datetime.now(UTC).replace(tzinfo=None),
+        profile_enabled=payload.profile,
     )
     db.add(job)
     db.commit()
@@ -517,17 +692,133 @@ def publish_now(
 
 
 @router.get("/linkedin/jobs", response_model=list[JobOut])
-def list_jobs(
+async def list_jobs(
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
+    before: int | None = None,
+    after: int | None = None,
+    account_id: int | None = None,
+    status: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    current_user: User = Depends(get_current_user_async),
+):
+    query = (
+        select(Job)
+        .join(LinkedinAccount, LinkedinAccount.id == Job.account_id)
+        .where(LinkedinAccount.owner_user_id == current_user.id)
+    )
+    if account_id is not None:
+        query = query.filter(Job.account_id == account_id)
+    if status:
+        query = query.filter(Job.status == status)
+    query = _filter_created_range(query, Job.created_at, created_from, created_to)
+    return await _keyset_page(db, query, Job.id, limit, before, after)
+
+
+@router.get("/linkedin/jobs/{job_id}", response_model=JobDetailOut)
+def get_job(
+    job_id: int,
     db: Session = Depends(get_db),
-    limit: int = 50,
     current_user: User = Depends(get_current_user),
 ):
-    return (
+    job = (
         db.query(Job)
         .join(LinkedinAccount, LinkedinAccount.id == Job.account_id)
-        .filter(LinkedinAccount.owner_user_id == current_user.id)
-        .order_by(Job.id.desc())
-        .limit(limit)
+        .filter(Job.id == job_id, LinkedinAccount.owner_user_id == current_user.id)
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job nao encontrado.")
+    return job
+
+
+@router.get("/linkedin/jobs/{job_id}/logs", response_model=list[JobLogOut])
+async def list_job_logs(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+    before: int | None = None,
+    after: int | None = None,
+    current_user: User = Depends(get_current_user_async),
+):
+    job = await db.scalar(
+        select(Job.id)
+        .join(LinkedinAccount, LinkedinAccount.id == Job.account_id)
+        .where(Job.id == job_id, LinkedinAccount.owner_user_id == current_user.id)
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job nao encontrado.")
+
+    query = select(JobLog).where(JobLog.job_id == job_id)
+    return await _keyset_page(db, query, JobLog.id, limit, before, after, descending=False)
+
+
+@router.post("/linkedin/jobs/{job_id}/logs/stream-token", response_model=LogStreamTokenOut)
+def create_job_log_stream_token(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    job = (
+        db.query(Job.id)
+        .join(LinkedinAccount, LinkedinAccount.id == Job.account_id)
+        .filter(Job.id == job_id, LinkedinAccount.owner_user_id == current_user.id)
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job nao encontrado.")
+    return _stream_token_response(current_user, "linkedin", job_id)
+
+
+@router.get("/linkedin/jobs/{job_id}/logs/stream")
+def stream_job_logs(
+    job_id: int,
+    request: Request,
+    after: int | None = None,
+    stream_token: str | None = None,
+    last_event_id: str | None = Header(default=None),
+    authorization: str | None = Header(default=None),
+):
+    # Sessao so para autenticar e checar o dono; o stream abre as proprias sessoes a cada leitura.
+    with SessionLocal() as db:
+        user_id = _stream_user_id(db, "linkedin", job_id, stream_token, authorization)
+        job = (
+            db.query(Job.id)
+            .join(LinkedinAccount, LinkedinAccount.id == Job.account_id)
+            .filter(Job.id == job_id, LinkedinAccount.owner_user_id == user_id)
+            .first()
+        )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job nao encontrado.")
+
+    after_id = parse_last_event_id(last_event_id) or after
+    return StreamingResponse(
+        stream_job_events(request, Job, JobLog, JobLogOut, job_id, after_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/linkedin/jobs/{job_id}/llm-calls", response_model=list[LLMCallOut])
+def list_job_llm_calls(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    job = (
+        db.query(Job)
+        .join(LinkedinAccount, LinkedinAccount.id == Job.account_id)
+        .filter(Job.id == job_id, LinkedinAccount.owner_user_id == current_user.id)
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job nao encontrado.")
+
+    return (
+        db.query(LLMCall)
+        .filter(LLMCall.job_type == "linkedin", LLMCall.job_id == job_id)
+        .order_by(LLMCall.id.asc())
         .all()
     )
 
@@ -773,6 +1064,7 @@ def leetcode_run_now(
         problem_slug=payload.problem_slug,
         max_attempts=max_attempts,
         scheduled_for=datetime.now(UTC).replace(tzinfo=None),
+        profile_enabled=payload.profile,
     )
     db.add(job)
     db.commit()
@@ -781,20 +1073,28 @@ def leetcode_run_now(
 
 
 @router.get("/leetcode/jobs", response_model=list[LeetCodeJobOut])
-def list_leetcode_jobs(
-    db: Session = Depends(get_db),
-    limit: int = 50,
+async def list_leetcode_jobs(
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
     repository_id: int | None = None,
-    current_user: User = Depends(get_current_user),
+    before: int | None = None,
+    after: int | None = None,
+    status: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    current_user: User = Depends(get_current_user_async),
 ):
-    query = db.query(LeetCodeJob).join(GitHubRepository, GitHubRepository.id == LeetCodeJob.repository_id)
-    query = query.filter(GitHubRepository.owner_user_id == current_user.id)
+    query = select(LeetCodeJob).join(GitHubRepository, GitHubRepository.id == LeetCodeJob.repository_id)
+    query = query.where(GitHubRepository.owner_user_id == current_user.id)
     if repository_id is not None:
         query = query.filter(LeetCodeJob.repository_id == repository_id)
-    return query.order_by(LeetCodeJob.id.desc()).limit(limit).all()
+    if status:
+        query = query.filter(LeetCodeJob.status == status)
+    query = _filter_created_range(query, LeetCodeJob.created_at, created_from, created_to)
+    return await _keyset_page(db, query, LeetCodeJob.id, limit, before, after)
 
 
-@router.get("/leetcode/jobs/{job_id}", response_model=LeetCodeJobOut)
+@router.get("/leetcode/jobs/{job_id}", response_model=LeetCodeJobDetailOut)
 def get_leetcode_job(
     job_id: int,
     db: Session = Depends(get_db),
@@ -812,10 +1112,76 @@ def get_leetcode_job(
 
 
 @router.get("/leetcode/jobs/{job_id}/logs", response_model=list[LeetCodeJobLogOut])
-def list_leetcode_job_logs(
+async def list_leetcode_job_logs(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+    before: int | None = None,
+    after: int | None = None,
+    current_user: User = Depends(get_current_user_async),
+):
+    job = await db.scalar(
+        select(LeetCodeJob.id)
+        .join(GitHubRepository, GitHubRepository.id == LeetCodeJob.repository_id)
+        .where(LeetCodeJob.id == job_id, GitHubRepository.owner_user_id == current_user.id)
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job LeetCode nao encontrado.")
+
+    query = select(LeetCodeJobLog).where(LeetCodeJobLog.job_id == job_id)
+    return await _keyset_page(db, query, LeetCodeJobLog.id, limit, before, after, descending=False)
+
+
+@router.post("/leetcode/jobs/{job_id}/logs/stream-token", response_model=LogStreamTokenOut)
+def create_leetcode_job_log_stream_token(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    job = (
+        db.query(LeetCodeJob.id)
+        .join(GitHubRepository, GitHubRepository.id == LeetCodeJob.repository_id)
+        .filter(LeetCodeJob.id == job_id, GitHubRepository.owner_user_id == current_user.id)
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job LeetCode nao encontrado.")
+    return _stream_token_response(current_user, "leetcode", job_id)
+
+
+@router.get("/leetcode/jobs/{job_id}/logs/stream")
+def stream_leetcode_job_logs(
+    job_id: int,
+    request: Request,
+    after: int | None = None,
+    stream_token: str | None = None,
+    last_event_id: str | None = Header(default=None),
+    authorization: str | None = Header(default=None),
+):
+    # Sessao so para autenticar e checar o dono; o stream abre as proprias sessoes a cada leitura.
+    with SessionLocal() as db:
+        user_id = _stream_user_id(db, "leetcode", job_id, stream_token, authorization)
+        job = (
+            db.query(LeetCodeJob.id)
+            .join(GitHubRepository, GitHubRepository.id == LeetCodeJob.repository_id)
+            .filter(LeetCodeJob.id == job_id, GitHubRepository.owner_user_id == user_id)
+            .first()
+        )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job LeetCode nao encontrado.")
+
+    after_id = parse_last_event_id(last_event_id) or after
+    return StreamingResponse(
+        stream_job_events(request, LeetCodeJob, LeetCodeJobLog, LeetCodeJobLogOut, job_id, after_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/leetcode/jobs/{job_id}/llm-calls", response_model=list[LLMCallOut])
+def list_leetcode_job_llm_calls(
     job_id: int,
     db: Session = Depends(get_db),
-    limit: int = 100,
     current_user: User = Depends(get_current_user),
 ):
     job = (
@@ -828,10 +1194,9 @@ def list_leetcode_job_logs(
         raise HTTPException(status_code=404, detail="Job LeetCode nao encontrado.")
 
     return (
-        db.query(LeetCodeJobLog)
-        .filter(LeetCodeJobLog.job_id == job_id)
-        .order_by(LeetCodeJobLog.id.asc())
-        .limit(limit)
+        db.query(LLMCall)
+        .filter(LLMCall.job_type == "leetcode", LLMCall.job_id == job_id)
+        .order_by(LLMCall.id.asc())
         .all()
     )
 
@@ -962,17 +1327,67 @@ def delete_leetcode_schedule(
 
 
 @router.get("/leetcode/completed", response_model=list[LeetCodeCompletedOut])
-def list_leetcode_completed(
-    db: Session = Depends(get_db),
+async def list_leetcode_completed(
+    db: AsyncSession = Depends(get_async_db),
     repository_id: int | None = None,
-    limit: int = 100,
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+    before: int | None = None,
+    after: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    current_user: User = Depends(get_current_user_async),
 ):
-    query = db.query(LeetCodeCompletedProblem).join(
+    query = select(LeetCodeCompletedProblem).join(
         GitHubRepository,
         GitHubRepository.id == LeetCodeCompletedProblem.repository_id,
     )
-    query = query.filter(GitHubRepository.owner_user_id == current_user.id)
+    query = query.where(GitHubRepository.owner_user_id == current_user.id)
     if repository_id is not None:
         query = query.filter(LeetCodeCompletedProblem.repository_id == repository_id)
-    return query.order_by(LeetCodeCompletedProblem.id.desc()).limit(limit).all()
+    query = _filter_created_range(query, LeetCodeCompletedProblem.created_at, created_from, created_to)
+    return await _keyset_page(db, query, LeetCodeCompletedProblem.id, limit, before, after)
+
+
+@router.get("/llm-calls/summary", response_model=list[LLMUsageSummaryOut])
+def llm_usage_summary(
+    db: Session = Depends(get_db),
+    job_type: str | None = None,
+    days: int = 7,
+    current_user: User = Depends(get_current_user),
+):
+    since = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=max(1, days))
+    query = db.query(
+        LLMCall.job_type,
+        LLMCall.stage,
+        LLMCall.provider,
+        LLMCall.model,
+        func.count(LLMCall.id),
+        func.count(LLMCall.id).filter(LLMCall.success.is_(False)),
+        func.count(LLMCall.id).filter(LLMCall.cache_hit.is_(True)),
+        func.coalesce(func.sum(LLMCall.prompt_tokens), 0),
+        func.coalesce(func.sum(LLMCall.completion_tokens), 0),
+        func.coalesce(func.sum(LLMCall.latency_ms), 0),
+    ).filter(LLMCall.owner_user_id == current_user.id, LLMCall.created_at >= since)
+    if job_type is not None:
+        query = query.filter(LLMCall.job_type == job_type)
+    rows = (
+        query.group_by(LLMCall.job_type, LLMCall.stage, LLMCall.provider, LLMCall.model)
+        .order_by(func.sum(LLMCall.latency_ms).desc())
+        .all()
+    )
+    return [
+        LLMUsageSummaryOut(
+            job_type=row[0],
+            stage=row[1],
+            provider=row[2],
+            model=row[3],
+            calls=row[4],
+            failed_calls=row[5],
+            cache_hits=row[6],
+            prompt_tokens=row[7],
+            completion_tokens=row[8],
+            total_latency_ms=row[9],
+            avg_latency_ms=round(row[9] / row[4], 1) if row[4] else 0.0,
+        )
+        for row in rows
+    ]
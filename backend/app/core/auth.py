@@ -5,6 +5,7 @@ import hashlib
 import hmac
 import os
 import secrets
+import time
 from datetime import UTC, datetime, timedelta
 
 
@@ -44,3 +45,30 @@ def hash_token(token: str) -> str:
 
 def token_expires_at(ttl_hours: int) -> datetime:
     return datetime.now(UTC).replace(tzinfo=None) + timedelta(hours=ttl_hours)
+
+
+def _stream_signature(secret: str, payload: str) -> str:
+    key = hashlib.sha256(f'log-stream:{secret}'.encode('utf-8')).digest()
+    digest = hmac.new(key, payload.encode('utf-8'), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode('ascii').rstrip('=')
+
+
+def create_stream_token(secret: str, user_id: int, scope: str, job_id: int, ttl_seconds: int) -> str:
+    """Token curto e assinado para abrir o stream SSE de um job via query string (o EventSource nao envia headers)."""
+    payload = f'{user_id}.{scope}.{job_id}.{int(time.time()) + ttl_seconds}'
+    return f'{payload}.{_stream_signature(secret, payload)}'
+
+
+def verify_stream_token(secret: str, token: str, scope: str, job_id: int) -> int | None:
+    """Id do usuario se o token for valido para este job e ainda nao tiver expirado."""
+    payload, _, signature = token.rpartition('.')
+    if not payload or not hmac.compare_digest(signature, _stream_signature(secret, payload)):
+        return None
+    try:
+        user_text, token_scope, job_text, expires_text = payload.split('.')
+        user_id, token_job_id, expires = int(user_text), int(job_text), int(expires_text)
+    except ValueError:
+        return None
+    if token_scope != scope or token_job_id != job_id or expires < time.time():
+        return None
+    return user_id
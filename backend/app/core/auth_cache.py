@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from app.core.settings import settings
+
+
+@dataclass(frozen=True)
+class CachedAuth:
+    token_id: int
+    user_id: int
+    expires_at: datetime
+    user_state: dict[str, Any]
+    cached_at: float
+
+
+class AuthTokenCache:
+    """Cache em memoria de token -> snapshot do usuario, com `last_used_at` coalescido.
+
+    Cada processo da API tem o proprio cache: revogacao/desativacao feita por outra replica
+    so e percebida aqui apos `ttl_seconds`.
+    """
+
+    def __init__(self, ttl_seconds: int = 60, touch_interval_seconds: int = 60, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.touch_interval_seconds = touch_interval_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, CachedAuth] = OrderedDict()
+        self._last_touch_flush: dict[int, float] = {}
+        self._pending_touches: set[int] = set()
+
+    def get(self, token_hash: str, now: datetime) -> CachedAuth | None:
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.cached_at > self.ttl_seconds or entry.expires_at <= now:
+                del self._entries[token_hash]
+                return None
+            self._entries.move_to_end(token_hash)
+            return entry
+
+    def put(
+        self,
+        token_hash: str,
+        token_id: int,
+        user_id: int,
+        expires_at: datetime,
+        user_state: dict[str, Any],
+    ) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        entry = CachedAuth(
+            token_id=token_id,
+            user_id=user_id,
+            expires_at=expires_at,
+            user_state=user_state,
+            cached_at=time.monotonic(),
+        )
+        with self._lock:
+            self._entries[token_hash] = entry
+            self._entries.move_to_end(token_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_token(self, token_hash: str) -> None:
+        with self._lock:
+            self._entries.pop(token_hash, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for token_hash in [key for key, entry in self._entries.items() if entry.user_id == user_id]:
+                del self._entries[token_hash]
+
+    def touch(self, token_id: int) -> list[int]:
+        """Marca uso do token e devolve os tokens cujo `last_used_at` ja deve ser gravado."""
+        now = time.monotonic()
+        with self._lock:
+            self._pending_touches.add(token_id)
+            last_flush = self._last_touch_flush.get(token_id)
+            if last_flush is not None and now - last_flush < self.touch_interval_seconds:
+                return []
+            # Leva junto todos os pendentes: um UPDATE por janela em vez de um por request.
+            due = list(self._pending_touches)
+            self._pending_touches.clear()
+            self._last_touch_flush = {
+                key: flushed_at
+                for key, flushed_at in self._last_touch_flush.items()
+                if now - flushed_at < self.touch_interval_seconds
+            }
+            for pending_id in due:
+                self._last_touch_flush[pending_id] = now
+            return due
+
+
+auth_token_cache = AuthTokenCache(
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+    touch_interval_seconds=settings.auth_last_used_flush_seconds,
+)
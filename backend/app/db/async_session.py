@@ -0,0 +1,35 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.settings import settings
+from app.db.session import engine_options, install_idle_ping
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def _async_database_url(database_url: str) -> str:
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(
+    _async_database_url(settings.database_url),
+    **{
+        **engine_options(),
+        "pool_size": settings.db_async_pool_size,
+        "max_overflow": settings.db_async_max_overflow,
+    },
+)
+install_idle_ping(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
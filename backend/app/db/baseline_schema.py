@@ -0,0 +1,237 @@
+"""
+Snapshot congelado do schema anterior ao controle de versao (migracao 1).
+
+Nao importe os models aqui nem edite estas tabelas: mudancas de schema entram como
+novas migracoes em `migrations.py`. Os nomes de indice seguem o padrao `ix_<tabela>_<coluna>`
+que o SQLAlchemy gerava para `index=True` nos models da epoca.
+"""
+from __future__ import annotations
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+)
+
+baseline_metadata = MetaData()
+
+Table(
+    "users",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String(255), unique=True, index=True),
+    Column("password_hash", String(255)),
+    Column("is_active", Boolean),
+    Column("leetcode_solution_prompt", Text, nullable=True),
+    Column("openai_api_key_encrypted", Text, nullable=True),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "auth_tokens",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), index=True),
+    Column("token_hash", String(64), unique=True, index=True),
+    Column("expires_at", DateTime, index=True),
+    Column("revoked", Boolean),
+    Column("created_at", DateTime),
+    Column("last_used_at", DateTime, nullable=True),
+)
+
+Table(
+    "linkedin_accounts",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("owner_user_id", Integer, ForeignKey("users.id"), index=True, nullable=True),
+    Column("name", String(120), index=True),
+    Column("token_encrypted", Text),
+    Column("urn", String(255)),
+    Column("prompt_generation", Text, nullable=True),
+    Column("prompt_translation", Text, nullable=True),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    UniqueConstraint("owner_user_id", "name", name="uq_linkedin_account_owner_name"),
+)
+
+Table(
+    "schedules",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("account_id", Integer, ForeignKey("linkedin_accounts.id"), index=True),
+    Column("topic", String(255)),
+    Column("cron_expr", String(120)),
+    Column("source_mode", String(32)),
+    Column("objective", String(64), nullable=True),
+    Column("audience", String(120), nullable=True),
+    Column("cta_type", String(32), nullable=True),
+    Column("campaign_theme", String(255), nullable=True),
+    Column("use_date_context", Boolean),
+    Column("day_of_week", Integer, nullable=True),
+    Column("time_local", String(5), nullable=True),
+    Column("timezone", String(64)),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "jobs",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("account_id", Integer, ForeignKey("linkedin_accounts.id"), index=True),
+    Column("source", String(32)),
+    Column("status", String(32), index=True),
+    Column("topic", String(255), nullable=True),
+    Column("paper_url", Text, nullable=True),
+    Column("paper_text", Text, nullable=True),
+    Column("generated_post", Text, nullable=True),
+    Column("error_message", Text, nullable=True),
+    Column("attempts", Integer),
+    Column("max_attempts", Integer),
+    Column("scheduled_for", DateTime, index=True),
+    Column("next_retry_at", DateTime, nullable=True, index=True),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "job_logs",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("job_id", Integer, ForeignKey("jobs.id"), index=True),
+    Column("level", String(16)),
+    Column("message", Text),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "schedule_runs",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("schedule_id", Integer, ForeignKey("schedules.id"), index=True),
+    Column("run_minute_utc", DateTime, index=True),
+    Column("created_at", DateTime),
+    UniqueConstraint("schedule_id", "run_minute_utc", name="uq_schedule_run"),
+)
+
+Table(
+    "github_accounts",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("owner_user_id", Integer, ForeignKey("users.id"), index=True, nullable=True),
+    Column("name", String(120), index=True),
+    Column("ssh_key_encrypted", Text),
+    Column("ssh_passphrase_encrypted", Text, nullable=True),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    UniqueConstraint("owner_user_id", "name", name="uq_github_account_owner_name"),
+)
+
+Table(
+    "github_repositories",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("owner_user_id", Integer, ForeignKey("users.id"), index=True, nullable=True),
+    Column("account_id", Integer, ForeignKey("github_accounts.id"), index=True),
+    Column("repo_ssh_url", String(255), index=True),
+    Column("default_branch", String(64)),
+    Column("solutions_dir", String(255)),
+    Column("commit_author_name", String(120)),
+    Column("commit_author_email", String(255)),
+    Column("selection_strategy", String(32)),
+    Column("difficulty_policy", String(32)),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    UniqueConstraint("owner_user_id", "repo_ssh_url", name="uq_github_repo_owner_url"),
+)
+
+Table(
+    "leetcode_schedules",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("repository_id", Integer, ForeignKey("github_repositories.id"), index=True),
+    Column("cron_expr", String(120)),
+    Column("day_of_week", Integer, nullable=True),
+    Column("time_local", String(5), nullable=True),
+    Column("timezone", String(64)),
+    Column("selection_strategy", String(32), nullable=True),
+    Column("difficulty_policy", String(32), nullable=True),
+    Column("max_attempts", Integer),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "leetcode_schedule_runs",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("schedule_id", Integer, ForeignKey("leetcode_schedules.id"), index=True),
+    Column("run_minute_utc", DateTime, index=True),
+    Column("created_at", DateTime),
+    UniqueConstraint("schedule_id", "run_minute_utc", name="uq_leetcode_schedule_run"),
+)
+
+Table(
+    "leetcode_jobs",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("repository_id", Integer, ForeignKey("github_repositories.id"), index=True),
+    Column("schedule_id", Integer, ForeignKey("leetcode_schedules.id"), nullable=True, index=True),
+    Column("source", String(32)),
+    Column("status", String(32), index=True),
+    Column("attempts", Integer),
+    Column("max_attempts", Integer),
+    Column("selection_strategy", String(32), nullable=True),
+    Column("difficulty_policy", String(32), nullable=True),
+    Column("problem_frontend_id", String(32), nullable=True),
+    Column("problem_slug", String(255), nullable=True),
+    Column("problem_title", String(255), nullable=True),
+    Column("problem_difficulty", String(32), nullable=True),
+    Column("solution_path", String(255), nullable=True),
+    Column("tests_path", String(255), nullable=True),
+    Column("commit_sha", String(64), nullable=True),
+    Column("commit_url", String(255), nullable=True),
+    Column("error_message", Text, nullable=True),
+    Column("scheduled_for", DateTime, index=True),
+    Column("next_retry_at", DateTime, nullable=True, index=True),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "leetcode_job_logs",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("job_id", Integer, ForeignKey("leetcode_jobs.id"), index=True),
+    Column("level", String(16)),
+    Column("message", Text),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "leetcode_completed_problems",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("repository_id", Integer, ForeignKey("github_repositories.id"), index=True),
+    Column("job_id", Integer, ForeignKey("leetcode_jobs.id"), unique=True, index=True),
+    Column("problem_frontend_id", String(32), index=True),
+    Column("problem_slug", String(255)),
+    Column("problem_title", String(255)),
+    Column("problem_difficulty", String(32)),
+    Column("commit_sha", String(64)),
+    Column("created_at", DateTime),
+    UniqueConstraint("repository_id", "problem_frontend_id", name="uq_leetcode_completed_problem"),
+)
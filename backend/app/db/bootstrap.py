@@ -1,39 +1,80 @@
-from sqlalchemy import inspect, text
+import logging
+from datetime import datetime
 
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, exc, func, inspect, select, text
+from sqlalchemy.engine import Connection
+
+from app import models  # noqa: F401  registra as tabelas em Base.metadata
 from app.db.base import Base
+from app.db.migrations import MIGRATIONS
 from app.db.session import engine
+from packages.shared import log_event
+
+logger = logging.getLogger("autofeedr.migrations")
+
+# Chave do advisory lock que serializa migracoes entre replicas no Postgres.
+MIGRATION_LOCK_KEY = 72_460_039
+
+version_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(120), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def head_version() -> int:
+    return max(migration.version for migration in MIGRATIONS)
+
+
+def current_version(conn: Connection) -> int | None:
+    try:
+        return conn.execute(select(func.max(schema_version.c.version))).scalar()
+    except (exc.OperationalError, exc.ProgrammingError):
+        return None
+
 
+def _is_empty_database(conn: Connection) -> bool:
+    tables = set(inspect(conn).get_table_names())
+    return not tables.intersection(Base.metadata.tables)
 
-def _column_exists(table_name: str, column_name: str) -> bool:
-    inspector = inspect(engine)
-    columns = [column["name"] for column in inspector.get_columns(table_name)]
-    return column_name in columns
 
+def _record(conn: Connection, version: int, name: str) -> None:
+    conn.execute(schema_version.insert().values(version=version, name=name, applied_at=datetime.utcnow()))
 
-def _add_column_if_missing(table_name: str, column_sql: str, column_name: str) -> None:
-    if _column_exists(table_name, column_name):
+
+def _upgrade(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+    version_metadata.create_all(bind=conn)
+    version = conn.execute(select(func.max(schema_version.c.version))).scalar()
+
+    if version is None and _is_empty_database(conn):
+        Base.metadata.create_all(bind=conn)
+        _record(conn, head_version(), "create_all")
+        log_event(logger, logging.INFO, "schema_created", version=head_version())
         return
-    with engine.begin() as conn:
-        conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_sql}"))
+
+    for migration in sorted(MIGRATIONS, key=lambda item: item.version):
+        if version is not None and migration.version <= version:
+            continue
+        migration.upgrade(conn)
+        _record(conn, migration.version, migration.name)
+        log_event(logger, logging.INFO, "schema_migrated", version=migration.version, name=migration.name)
 
 
 def ensure_schema() -> None:
-    Base.metadata.create_all(bind=engine)
-
-    _add_column_if_missing("linkedin_accounts", "prompt_generation TEXT", "prompt_generation")
-    _add_column_if_missing("linkedin_accounts", "prompt_translation TEXT", "prompt_translation")
-
-    _add_column_if_missing("schedules", "day_of_week INTEGER", "day_of_week")
-    _add_column_if_missing("schedules", "time_local VARCHAR(5)", "time_local")
-
-    _add_column_if_missing("schedules", "source_mode VARCHAR(32) DEFAULT 'arxiv'", "source_mode")
-    _add_column_if_missing("schedules", "objective VARCHAR(64)", "objective")
-    _add_column_if_missing("schedules", "audience VARCHAR(120)", "audience")
-    _add_column_if_missing("schedules", "cta_type VARCHAR(32)", "cta_type")
-    _add_column_if_missing("schedules", "campaign_theme VARCHAR(255)", "campaign_theme")
-    _add_column_if_missing("schedules", "use_date_context BOOLEAN DEFAULT TRUE", "use_date_context")
-    _add_column_if_missing("linkedin_accounts", "owner_user_id INTEGER", "owner_user_id")
-    _add_column_if_missing("github_accounts", "owner_user_id INTEGER", "owner_user_id")
-    _add_column_if_missing("github_repositories", "owner_user_id INTEGER", "owner_user_id")
-    _add_column_if_missing("users", "leetcode_solution_prompt TEXT", "leetcode_solution_prompt")
-    _add_column_if_missing("users", "openai_api_key_encrypted TEXT", "openai_api_key_encrypted")
+    """Aplica migracoes pendentes; no caminho comum faz so uma consulta de versao."""
+    with engine.connect() as conn:
+        if current_version(conn) == head_version():
+            return
+
+    with engine.begin() as conn:
+        _upgrade(conn)
+
+
+if __name__ == "__main__":
+    ensure_schema()
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    inspect,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+from app.db.baseline_schema import baseline_metadata
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+# Cada migracao descreve o schema da propria versao (DDL explicita ou tabelas congeladas aqui),
+# nunca os models atuais: um model alterado depois nao pode mudar o que uma migracao antiga faz.
+
+
+def add_column_if_missing(conn: Connection, table_name: str, column_sql: str, column_name: str) -> None:
+    columns = {column["name"] for column in inspect(conn).get_columns(table_name)}
+    if column_name in columns:
+        return
+    conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_sql}"))
+
+
+def create_index_if_missing(conn: Connection, name: str, table_name: str, columns: list[str]) -> None:
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table_name} ({', '.join(columns)})"))
+
+
+def drop_index_if_exists(conn: Connection, name: str) -> None:
+    conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def create_table_if_missing(conn: Connection, table: Table) -> None:
+    """Cria a tabela congelada e seus indices; os alvos de FK podem ser tabelas-stub so com `id`."""
+    table.create(bind=conn, checkfirst=True)
+
+
+def _stub_tables(metadata: MetaData, *names: str) -> None:
+    for name in names:
+        Table(name, metadata, Column("id", Integer, primary_key=True))
+
+
+# Colunas adicionadas antes do controle de versao; bancos antigos podem nao ter nenhuma delas.
+LEGACY_COLUMNS = [
+    ("linkedin_accounts", "prompt_generation TEXT", "prompt_generation"),
+    ("linkedin_accounts", "prompt_translation TEXT", "prompt_translation"),
+    ("schedules", "day_of_week INTEGER", "day_of_week"),
+    ("schedules", "time_local VARCHAR(5)", "time_local"),
+    ("schedules", "source_mode VARCHAR(32) DEFAULT 'arxiv'", "source_mode"),
+    ("schedules", "objective VARCHAR(64)", "objective"),
+    ("schedules", "audience VARCHAR(120)", "audience"),
+    ("schedules", "cta_type VARCHAR(32)", "cta_type"),
+    ("schedules", "campaign_theme VARCHAR(255)", "campaign_theme"),
+    ("schedules", "use_date_context BOOLEAN DEFAULT TRUE", "use_date_context"),
+    ("linkedin_accounts", "owner_user_id INTEGER", "owner_user_id"),
+    ("github_accounts", "owner_user_id INTEGER", "owner_user_id"),
+    ("github_repositories", "owner_user_id INTEGER", "owner_user_id"),
+    ("users", "leetcode_solution_prompt TEXT", "leetcode_solution_prompt"),
+    ("users", "openai_api_key_encrypted TEXT", "openai_api_key_encrypted"),
+]
+
+
+def _baseline(conn: Connection) -> None:
+    baseline_metadata.create_all(bind=conn)
+
+    inspector = inspect(conn)
+    columns_by_table: dict[str, set[str]] = {}
+    for table_name, column_sql, column_name in LEGACY_COLUMNS:
+        if table_name not in columns_by_table:
+            columns_by_table[table_name] = {column["name"] for column in inspector.get_columns(table_name)}
+        if column_name not in columns_by_table[table_name]:
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_sql}"))
+            columns_by_table[table_name].add(column_name)
+
+    # create_all nao cria indices em tabelas que ja existiam.
+    for table in baseline_metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+
+def _llm_calls_table(conn: Connection) -> None:
+    metadata = MetaData()
+    _stub_tables(metadata, "users")
+    create_table_if_missing(
+        conn,
+        Table(
+            "llm_calls",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column("owner_user_id", Integer, ForeignKey("users.id"), nullable=True),
+            Column("job_type", String(16)),
+            Column("job_id", Integer),
+            Column("stage", String(32)),
+            Column("provider", String(16)),
+            Column("model", String(120)),
+            Column("prompt_tokens", Integer),
+            Column("completion_tokens", Integer),
+            Column("cached_tokens", Integer),
+            Column("cache_hit", Boolean),
+            Column("latency_ms", Integer),
+            Column("success", Boolean),
+            Column("error_message", Text, nullable=True),
+            Column("created_at", DateTime),
+            Index("ix_llm_calls_job", "job_type", "job_id"),
+            Index("ix_llm_calls_owner_created", "owner_user_id", "created_at"),
+        ),
+    )
+
+
+def _job_trace_columns(conn: Connection) -> None:
+    for table_name in ("jobs", "leetcode_jobs"):
+        add_column_if_missing(conn, table_name, "profile_enabled BOOLEAN DEFAULT FALSE", "profile_enabled")
+        add_column_if_missing(conn, table_name, "trace_json TEXT", "trace_json")
+
+
+def _keyset_pagination_indexes(conn: Connection) -> None:
+    create_index_if_missing(conn, "ix_jobs_account_id_id", "jobs", ["account_id", "id"])
+    create_index_if_missing(conn, "ix_jobs_account_status_id", "jobs", ["account_id", "status", "id"])
+    create_index_if_missing(conn, "ix_leetcode_jobs_repository_id_id", "leetcode_jobs", ["repository_id", "id"])
+    create_index_if_missing(
+        conn, "ix_leetcode_jobs_repository_status_id", "leetcode_jobs", ["repository_id", "status", "id"]
+    )
+    create_index_if_missing(conn, "ix_leetcode_job_logs_job_id_id", "leetcode_job_logs", ["job_id", "id"])
+    create_index_if_missing(
+        conn, "ix_leetcode_completed_repository_id_id", "leetcode_completed_problems", ["repository_id", "id"]
+    )
+
+
+def _job_lookup_indexes(conn: Connection) -> None:
+    create_index_if_missing(conn, "ix_jobs_status_scheduled_for", "jobs", ["status", "scheduled_for"])
+    create_index_if_missing(
+        conn, "ix_leetcode_jobs_status_scheduled_for", "leetcode_jobs", ["status", "scheduled_for"]
+    )
+    create_index_if_missing(conn, "ix_job_logs_job_id_id", "job_logs", ["job_id", "id"])
+
+
+def _retention_indexes(conn: Connection) -> None:
+    for table_name in ("job_logs", "leetcode_job_logs", "schedule_runs", "leetcode_schedule_runs"):
+        create_index_if_missing(conn, f"ix_{table_name}_created_at", table_name, ["created_at"])
+
+
+def _arxiv_cache_tables(conn: Connection) -> None:
+    metadata = MetaData()
+    create_table_if_missing(
+        conn,
+        Table(
+            "arxiv_articles",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column("arxiv_id", String(255), unique=True, index=True),
+            Column("title", Text),
+            Column("summary", Text),
+            Column("authors_json", Text),
+            Column("url", Text),
+            Column("published", DateTime),
+            Column("updated", DateTime),
+            Column("fetched_at", DateTime),
+        ),
+    )
+    create_table_if_missing(
+        conn,
+        Table(
+            "arxiv_topic_results",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column("topic_key", String(255)),
+            Column("window_start", DateTime),
+            Column("window_end", DateTime),
+            Column("max_results", Integer),
+            Column("article_ids_json", Text),
+            Column("fetched_at", DateTime),
+            Column("expires_at", DateTime, index=True),
+            UniqueConstraint("topic_key", "window_start", "window_end", name="uq_arxiv_topic_window"),
+        ),
+    )
+
+
+def _used_articles_table(conn: Connection) -> None:
+    metadata = MetaData()
+    _stub_tables(metadata, "linkedin_accounts", "jobs")
+    create_table_if_missing(
+        conn,
+        Table(
+            "used_articles",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column("account_id", Integer, ForeignKey("linkedin_accounts.id")),
+            Column("arxiv_id", String(255)),
+            Column("content_hash", String(64)),
+            Column("job_id", Integer, ForeignKey("jobs.id"), nullable=True),
+            Column("created_at", DateTime),
+            UniqueConstraint("account_id", "arxiv_id", name="uq_used_articles_account_arxiv"),
+            Index("ix_used_articles_account_content_hash", "account_id", "content_hash"),
+        ),
+    )
+
+
+def _job_source_article(conn: Connection) -> None:
+    add_column_if_missing(conn, "jobs", "source_arxiv_id VARCHAR(255)", "source_arxiv_id")
+    add_column_if_missing(conn, "jobs", "source_content_hash VARCHAR(64)", "source_content_hash")
+
+
+def _drop_redundant_log_job_indexes(conn: Connection) -> None:
+    # Prefixo dos indices compostos (job_id, id) criados nas migracoes 4 e 5.
+    drop_index_if_exists(conn, "ix_job_logs_job_id")
+    drop_index_if_exists(conn, "ix_leetcode_job_logs_job_id")
+
+
+# Novas mudancas de schema entram aqui com a proxima versao; nunca edite uma migracao ja publicada.
+# Bancos novos sao criados pelos models atuais e marcados direto na ultima versao.
+MIGRATIONS: list[Migration] = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "llm_calls", _llm_calls_table),
+    Migration(3, "job_trace_columns", _job_trace_columns),
+    Migration(4, "keyset_pagination_indexes", _keyset_pagination_indexes),
+    Migration(5, "job_lookup_indexes", _job_lookup_indexes),
+    Migration(6, "retention_created_at_indexes", _retention_indexes),
+    Migration(7, "arxiv_article_cache", _arxiv_cache_tables),
+    Migration(8, "used_articles", _used_articles_table),
+    Migration(9, "job_source_article", _job_source_article),
+    Migration(10, "drop_redundant_log_job_indexes", _drop_redundant_log_job_indexes),
+]
@@ -1,10 +1,63 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.settings import settings
 
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+def engine_options() -> dict:
+    """Opcoes de pool comuns aos engines sync e async, vindas de Settings."""
+    options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping == "always",
+    }
+    if settings.database_url.startswith("postgresql+psycopg"):
+        # psycopg3 prepara no servidor as queries repetidas a partir de N execucoes na mesma conexao;
+        # `None` desativa (o default do driver e 5, entao o valor vai sempre explicito).
+        options["connect_args"] = {"prepare_threshold": settings.db_prepare_threshold}
+    return options
+
+
+def install_idle_ping(engine: Engine) -> None:
+    """Faz ping so em conexoes ociosas ha mais de `db_pool_ping_idle_seconds`."""
+    if settings.db_pool_pre_ping != "idle":
+        return
+
+    @event.listens_for(engine, "checkin")
+    def _mark_checkin(dbapi_connection, connection_record) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy) -> None:
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < settings.db_pool_ping_idle_seconds:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception as ping_error:
+            # O pool descarta a conexao e tenta outra.
+            raise exc.DisconnectionError() from ping_error
+        finally:
+            cursor.close()
+
+
+def pool_status(engine: Engine) -> dict[str, int]:
+    pool = engine.pool
+    stats = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        getter = getattr(pool, name, None)
+        if callable(getter):
+            stats[name] = getter()
+    return stats
+
+
+engine = create_engine(settings.database_url, **engine_options())
+install_idle_ping(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -1,9 +1,19 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router
 from app.core.settings import settings
+from app.db.async_session import async_engine
 from app.db.bootstrap import ensure_schema
+from app.db.session import engine, pool_status
+from packages.shared import configure_logging, log_event
+from packages.shared.metrics import HTTP_REQUEST_SECONDS
+
+logger = configure_logging("autofeedr.api")
 
 
 app = FastAPI(title=settings.app_name)
@@ -19,9 +29,40 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Usa o template da rota para nao explodir a cardinalidade com IDs.
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        HTTP_REQUEST_SECONDS.labels(method=request.method, route=route_path, status=str(status)).observe(
+            time.perf_counter() - started
+        )
+
+
+async def _log_pool_status() -> None:
+    while True:
+        await asyncio.sleep(settings.db_pool_log_seconds)
+        log_event(logger, logging.INFO, "db_pool_status", engine="sync", **pool_status(engine))
+        log_event(logger, logging.INFO, "db_pool_status", engine="async", **pool_status(async_engine.sync_engine))
+
+
 @app.on_event("startup")
 def startup_create_tables() -> None:
-    ensure_schema()
+    if settings.db_migrate_on_startup:
+        ensure_schema()
+
+
+@app.on_event("startup")
+async def startup_pool_logging() -> None:
+    if settings.db_pool_log_seconds > 0:
+        app.state.pool_log_task = asyncio.create_task(_log_pool_status())
 
 
 app.include_router(router)
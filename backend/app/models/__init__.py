@@ -1,4 +1,6 @@
 from .models import (
+    ArxivArticleRecord,
+    ArxivTopicResult,
     AuthToken,
     GitHubAccount,
     GitHubRepository,
@@ -10,8 +12,10 @@ from .models import (
     LeetCodeSchedule,
     LeetCodeScheduleRun,
     LinkedinAccount,
+    LLMCall,
     Schedule,
     ScheduleRun,
+    UsedArticle,
     User,
 )
 
@@ -30,4 +34,8 @@ __all__ = [
     "LeetCodeJob",
     "LeetCodeJobLog",
     "LeetCodeCompletedProblem",
+    "LLMCall",
+    "ArxivArticleRecord",
+    "ArxivTopicResult",
+    "UsedArticle",
 ]
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime
+from typing import Any
 
 from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -16,6 +19,15 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
 
+def _load_trace(trace_json: str | None) -> dict[str, Any] | None:
+    if not trace_json:
+        return None
+    try:
+        return json.loads(trace_json)
+    except ValueError:
+        return None
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -93,6 +105,11 @@ class Schedule(Base):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_account_id_id", "account_id", "id"),
+        Index("ix_jobs_account_status_id", "account_id", "status", "id"),
+        Index("ix_jobs_status_scheduled_for", "status", "scheduled_for"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     account_id: Mapped[int] = mapped_column(ForeignKey("linkedin_accounts.id"), index=True)
@@ -104,6 +121,9 @@ class Job(Base):
     paper_text: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     generated_post: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Artigo do arXiv que originou `generated_post`; marcado como usado quando a publicacao sai.
+    source_arxiv_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    source_content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     attempts: Mapped[int] = mapped_column(Integer, default=0)
@@ -111,21 +131,30 @@ class Job(Base):
     scheduled_for: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
     next_retry_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
 
+    profile_enabled: Mapped[bool] = mapped_column(Boolean, default=False)
+    trace_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     account: Mapped[LinkedinAccount] = relationship(back_populates="jobs")
     logs: Mapped[list[JobLog]] = relationship(back_populates="job", cascade="all, delete-orphan")
 
+    @property
+    def trace(self) -> dict[str, Any] | None:
+        return _load_trace(self.trace_json)
+
 
 class JobLog(Base):
     __tablename__ = "job_logs"
+    __table_args__ = (Index("ix_job_logs_job_id_id", "job_id", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    job_id: Mapped[int] = mapped_column(ForeignKey("jobs.id"), index=True)
+    # Sem indice proprio: `ix_job_logs_job_id_id` ja cobre as buscas so por `job_id`.
+    job_id: Mapped[int] = mapped_column(ForeignKey("jobs.id"))
     level: Mapped[str] = mapped_column(String(16), default="INFO")
     message: Mapped[str] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
     job: Mapped[Job] = relationship(back_populates="logs")
 
@@ -139,7 +168,7 @@ class ScheduleRun(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     schedule_id: Mapped[int] = mapped_column(ForeignKey("schedules.id"), index=True)
     run_minute_utc: Mapped[datetime] = mapped_column(DateTime, index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
 
 class GitHubAccount(Base):
@@ -224,11 +253,16 @@ class LeetCodeScheduleRun(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     schedule_id: Mapped[int] = mapped_column(ForeignKey("leetcode_schedules.id"), index=True)
     run_minute_utc: Mapped[datetime] = mapped_column(DateTime, index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
 
 class LeetCodeJob(Base):
     __tablename__ = "leetcode_jobs"
+    __table_args__ = (
+        Index("ix_leetcode_jobs_repository_id_id", "repository_id", "id"),
+        Index("ix_leetcode_jobs_repository_status_id", "repository_id", "status", "id"),
+        Index("ix_leetcode_jobs_status_scheduled_for", "status", "scheduled_for"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     repository_id: Mapped[int] = mapped_column(ForeignKey("github_repositories.id"), index=True)
@@ -257,21 +291,30 @@ class LeetCodeJob(Base):
     scheduled_for: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
     next_retry_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
 
+    profile_enabled: Mapped[bool] = mapped_column(Boolean, default=False)
+    trace_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     repository: Mapped[GitHubRepository] = relationship(back_populates="jobs")
     logs: Mapped[list[LeetCodeJobLog]] = relationship(back_populates="job", cascade="all, delete-orphan")
 
+    @property
+    def trace(self) -> dict[str, Any] | None:
+        return _load_trace(self.trace_json)
+
 
 class LeetCodeJobLog(Base):
     __tablename__ = "leetcode_job_logs"
+    __table_args__ = (Index("ix_leetcode_job_logs_job_id_id", "job_id", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    job_id: Mapped[int] = mapped_column(ForeignKey("leetcode_jobs.id"), index=True)
+    # Sem indice proprio: `ix_leetcode_job_logs_job_id_id` ja cobre as buscas so por `job_id`.
+    job_id: Mapped[int] = mapped_column(ForeignKey("leetcode_jobs.id"))
     level: Mapped[str] = mapped_column(String(16), default="INFO")
     message: Mapped[str] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
     job: Mapped[LeetCodeJob] = relationship(back_populates="logs")
 
@@ -280,6 +323,7 @@ class LeetCodeCompletedProblem(Base):
     __tablename__ = "leetcode_completed_problems"
     __table_args__ = (
         UniqueConstraint("repository_id", "problem_frontend_id", name="uq_leetcode_completed_problem"),
+        Index("ix_leetcode_completed_repository_id_id", "repository_id", "id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -294,3 +338,72 @@ class LeetCodeCompletedProblem(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     repository: Mapped[GitHubRepository] = relationship(back_populates="completed_problems")
+
+
+class LLMCall(Base):
+    __tablename__ = "llm_calls"
+    __table_args__ = (
+        Index("ix_llm_calls_job", "job_type", "job_id"),
+        Index("ix_llm_calls_owner_created", "owner_user_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    owner_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
+    job_type: Mapped[str] = mapped_column(String(16))
+    job_id: Mapped[int] = mapped_column(Integer)
+    stage: Mapped[str] = mapped_column(String(32))
+    provider: Mapped[str] = mapped_column(String(16))
+    model: Mapped[str] = mapped_column(String(120))
+    prompt_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    cached_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    cache_hit: Mapped[bool] = mapped_column(Boolean, default=False)
+    latency_ms: Mapped[int] = mapped_column(Integer, default=0)
+    success: Mapped[bool] = mapped_column(Boolean, default=True)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ArxivArticleRecord(Base):
+    __tablename__ = "arxiv_articles"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    arxiv_id: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    title: Mapped[str] = mapped_column(Text)
+    summary: Mapped[str] = mapped_column(Text)
+    authors_json: Mapped[str] = mapped_column(Text, default="[]")
+    url: Mapped[str] = mapped_column(Text)
+    published: Mapped[datetime] = mapped_column(DateTime)
+    updated: Mapped[datetime] = mapped_column(DateTime)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ArxivTopicResult(Base):
+    __tablename__ = "arxiv_topic_results"
+    __table_args__ = (
+        UniqueConstraint("topic_key", "window_start", "window_end", name="uq_arxiv_topic_window"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    topic_key: Mapped[str] = mapped_column(String(255))
+    window_start: Mapped[datetime] = mapped_column(DateTime)
+    window_end: Mapped[datetime] = mapped_column(DateTime)
+    max_results: Mapped[int] = mapped_column(Integer)
+    article_ids_json: Mapped[str] = mapped_column(Text, default="[]")
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+
+class UsedArticle(Base):
+    __tablename__ = "used_articles"
+    __table_args__ = (
+        UniqueConstraint("account_id", "arxiv_id", name="uq_used_articles_account_arxiv"),
+        Index("ix_used_articles_account_content_hash", "account_id", "content_hash"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    account_id: Mapped[int] = mapped_column(ForeignKey("linkedin_accounts.id"))
+    arxiv_id: Mapped[str] = mapped_column(String(255))
+    content_hash: Mapped[str] = mapped_column(String(64))
+    job_id: Mapped[int | None] = mapped_column(ForeignKey("jobs.id"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
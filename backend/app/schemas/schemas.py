@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 from datetime import datetime
+from typing import Any
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -36,6 +37,11 @@ class AuthTokenOut(BaseModel):
     user: AuthUserOut
 
 
+class LogStreamTokenOut(BaseModel):
+    stream_token: str
+    expires_in: int
+
+
 class OpenAIKeyUpdate(BaseModel):
     api_key: str = Field(min_length=20, max_length=500)
 
@@ -129,6 +135,7 @@ class ManualJobCreate(BaseModel):
     topic: str | None = None
     paper_url: str | None = None
     paper_text: str | None = None
+    profile: bool = False
 
     @field_validator("paper_url")
     @classmethod
@@ -165,6 +172,11 @@ class JobOut(BaseModel):
         from_attributes = True
 
 
+class JobDetailOut(JobOut):
+    profile_enabled: bool
+    trace: dict[str, Any] | None = None
+
+
 class GitHubAccountCreate(BaseModel):
     name: str = Field(min_length=2, max_length=120)
     ssh_private_key: str = Field(min_length=40)
@@ -262,6 +274,7 @@ class LeetCodeRunNowCreate(BaseModel):
     difficulty_policy: str | None = None
     problem_slug: str | None = None
     max_attempts: int | None = Field(default=None, ge=1, le=10)
+    profile: bool = False
 
     @field_validator("problem_slug")
     @classmethod
@@ -349,6 +362,22 @@ class LeetCodeJobOut(BaseModel):
         from_attributes = True
 
 
+class LeetCodeJobDetailOut(LeetCodeJobOut):
+    profile_enabled: bool
+    trace: dict[str, Any] | None = None
+
+
+class JobLogOut(BaseModel):
+    id: int
+    job_id: int
+    level: str
+    message: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class LeetCodeJobLogOut(BaseModel):
     id: int
     job_id: int
@@ -373,3 +402,37 @@ class LeetCodeCompletedOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class LLMCallOut(BaseModel):
+    id: int
+    job_type: str
+    job_id: int
+    stage: str
+    provider: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    cache_hit: bool
+    latency_ms: int
+    success: bool
+    error_message: str | None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LLMUsageSummaryOut(BaseModel):
+    job_type: str
+    stage: str
+    provider: str
+    model: str
+    calls: int
+    failed_calls: int
+    cache_hits: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_latency_ms: int
+    avg_latency_ms: float
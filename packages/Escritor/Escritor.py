@@ -1,9 +1,14 @@
+import logging
 from typing import Optional
+
+from packages.shared import LLMCallCallback, log_event
+
 from .src.prompt import PROMPT_GERACAO_POST
 from .src.utils import conectar_ia, gerar_resposta
 
 MAX_SECTION_CHARS = 1400
 MAX_LINKEDIN_POST_CHARS = 3000
+logger = logging.getLogger("autofeedr.escritor")
 
 def _fit_text_limit(text: str, limit: int) -> str:
     """Garante limite por caracteres sem retornar string vazia."""
@@ -35,42 +40,41 @@ def gerar_post(
     prompt_generation: str | None = None,
     prompt_translation: str | None = None,
     openai_api_key: str | None = None,
+    on_llm_call: LLMCallCallback | None = None,
 ) -> Optional[str]:
 
-    print("Conectando ao provedor de IA...")
-    modelo = conectar_ia(openai_api_key=openai_api_key)
+    modelo = conectar_ia(openai_api_key=openai_api_key, on_llm_call=on_llm_call)
 
     # Gera o post em portugues a partir do prompt base.
     prompt_template_pt = prompt_generation or PROMPT_GERACAO_POST
     prompt_pt_br = prompt_template_pt.format(informacoes=informacoes)
     try:
-        post_pt_br = gerar_resposta(modelo, prompt_pt_br)
+        post_pt_br = gerar_resposta(modelo, prompt_pt_br, etapa="post_pt_br")
     except Exception as exc:
         raise RuntimeError(f"Falha ao gerar post em PT-BR: {exc}") from exc
     post_pt_br = _fit_text_limit(post_pt_br, MAX_SECTION_CHARS)
-    print("Post em PT-BR gerado.")
+    log_event(logger, logging.DEBUG, "post_pt_br_generated", chars=len(post_pt_br))
 
     # Sem prompt de traducao, publica apenas em portugues.
     prompt_template_translation = (prompt_translation or "").strip()
     if not prompt_template_translation:
         post = _fit_text_limit(post_pt_br, MAX_LINKEDIN_POST_CHARS)
-        print("Prompt de traducao ausente. Publicando apenas em PT-BR.")
-        print(f"Post final montado ({len(post)} caracteres).")
+        log_event(logger, logging.DEBUG, "post_ready", chars=len(post), translated=False)
         return post
 
     # Traduz o post para ingles (US) mantendo o estilo.
     prompt_traducao = prompt_template_translation.format(post_portugues=post_pt_br)
     try:
-        post_en_us = gerar_resposta(modelo, prompt_traducao)
+        post_en_us = gerar_resposta(modelo, prompt_traducao, etapa="post_en_us")
     except Exception as exc:
         raise RuntimeError(f"Falha ao gerar post em EN-US: {exc}") from exc
     post_en_us = _fit_text_limit(post_en_us, MAX_SECTION_CHARS)
-    print("Post em EN-US gerado.")
+    log_event(logger, logging.DEBUG, "post_en_us_generated", chars=len(post_en_us))
 
     post = _montar_post_bilingue(post_pt_br, post_en_us)
     if len(post) > MAX_LINKEDIN_POST_CHARS:
-        print("Post excedeu limite do LinkedIn apos ajustes. Abortando.")
+        log_event(logger, logging.WARNING, "post_over_linkedin_limit", chars=len(post), limit=MAX_LINKEDIN_POST_CHARS)
         return None
 
-    print(f"Post final montado ({len(post)} caracteres).")
+    log_event(logger, logging.DEBUG, "post_ready", chars=len(post), translated=True)
     return post
@@ -1,16 +1,33 @@
 from __future__ import annotations
 
+import json
+import logging
+import re
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any, List
+from typing import Any, Iterable, List
 
 import dotenv
 import requests
 from google import genai
 
-from packages.shared import load_ai_config
+from packages.shared import (
+    LLM_SCHEDULER,
+    LLMCallCallback,
+    LLMCallRecord,
+    load_ai_config,
+    log_event,
+    resolve_tenant,
+    span,
+)
+from packages.shared.metrics import EXTERNAL_CALL_SECONDS
 
 dotenv.load_dotenv()
 
+logger = logging.getLogger("autofeedr.escritor.utils")
+CODE_FENCE_PATTERN = re.compile(r"```(?:python)?\s*.*?```", re.DOTALL | re.IGNORECASE)
+
 
 @dataclass
 class AISession:
@@ -19,29 +36,51 @@ class AISession:
     gemini_client: genai.Client | None = None
     openai_api_key: str | None = None
     openai_base_url: str | None = None
+    stream: bool = False
+    timeout_seconds: float = 60.0
+    max_output_tokens: int | None = None
+    tenant: str | None = None
+    on_llm_call: LLMCallCallback | None = None
+    # Sinal para abandonar a chamada: nao inicia se ja setado e, no streaming, fecha a conexao no proximo trecho.
+    cancel_event: threading.Event | None = None
 
 
-def conectar_ia(openai_api_key: str | None = None) -> AISession:
+def conectar_ia(
+    openai_api_key: str | None = None,
+    on_llm_call: LLMCallCallback | None = None,
+) -> AISession:
     config = load_ai_config()
 
     if config.provider == "gemini":
         if not config.gemini_api_key:
             raise ValueError("GEMINI_API_KEY nao configurada no ambiente.")
-        print("Configurando cliente IA (Gemini)...")
         client = genai.Client(api_key=config.gemini_api_key)
-        print(f"Modelo selecionado: {config.model}")
-        return AISession(provider="gemini", model=config.model, gemini_client=client)
+        log_event(logger, logging.DEBUG, "llm_client_configured", provider="gemini", model=config.model)
+        return AISession(
+            provider="gemini",
+            model=config.model,
+            gemini_client=client,
+            stream=config.stream,
+            timeout_seconds=config.timeout_seconds,
+            max_output_tokens=config.max_output_tokens,
+            tenant=resolve_tenant(config=config),
+            on_llm_call=on_llm_call,
+        )
 
     api_key = (openai_api_key or "").strip()
     if not api_key:
         raise ValueError("OPENAI_API_KEY do usuario nao configurada.")
-    print("Configurando cliente IA (OpenAI)...")
-    print(f"Modelo selecionado: {config.model}")
+    log_event(logger, logging.DEBUG, "llm_client_configured", provider="openai", model=config.model)
     return AISession(
         provider="openai",
         model=config.model,
         openai_api_key=api_key,
         openai_base_url=config.openai_base_url,
+        stream=config.stream,
+        timeout_seconds=config.timeout_seconds,
+        max_output_tokens=config.max_output_tokens,
+        tenant=resolve_tenant(api_key, config),
+        on_llm_call=on_llm_call,
     )
 
 
@@ -50,27 +89,53 @@ def conectar_gemini() -> AISession:
     return conectar_ia()
 
 
-def gerar_resposta(modelo: AISession, prompt: str) -> str:
+def gerar_resposta(
+    modelo: AISession,
+    prompt: str,
+    parar_apos_codigo: bool = False,
+    etapa: str = "default",
+) -> str:
+    """Gera resposta da IA; com `parar_apos_codigo`, o streaming encerra no fim do bloco de codigo."""
+    uso: dict[str, int] = {}
+    texto = ""
+    enviada = False
+    inicio = time.monotonic()
     try:
-        print(f"Enviando prompt para IA ({modelo.provider})...")
-        if modelo.provider == "gemini":
-            if not modelo.gemini_client:
-                raise RuntimeError("Sessao Gemini invalida.")
-            resposta = modelo.gemini_client.models.generate_content(
-                model=modelo.model,
-                contents=prompt,
-            )
-            texto = (resposta.text or "").strip()
-        else:
-            texto = _gerar_resposta_openai(modelo, prompt)
+        log_event(logger, logging.DEBUG, "llm_request", provider=modelo.provider, stage=etapa, prompt_chars=len(prompt))
+        with span("llm_call", stage=etapa, provider=modelo.provider), LLM_SCHEDULER.slot(modelo.tenant):
+            _checar_cancelamento(modelo)
+            enviada = True
+            if modelo.provider == "gemini":
+                if not modelo.gemini_client:
+                    raise RuntimeError("Sessao Gemini invalida.")
+                if modelo.stream:
+                    texto = _gerar_resposta_gemini_stream(modelo, prompt, parar_apos_codigo, uso)
+                else:
+                    resposta = modelo.gemini_client.models.generate_content(
+                        model=modelo.model,
+                        contents=prompt,
+                        config=_gemini_config(modelo),
+                    )
+                    _uso_gemini(resposta, uso)
+                    texto = (resposta.text or "").strip()
+            elif modelo.stream:
+                texto = _gerar_resposta_openai_stream(modelo, prompt, parar_apos_codigo, uso)
+            else:
+                texto = _gerar_resposta_openai(modelo, prompt, uso)
 
         if not texto:
             raise RuntimeError(f"Resposta vazia da IA ({modelo.provider}).")
 
-        print("Resposta recebida da IA.")
+        log_event(logger, logging.DEBUG, "llm_response", provider=modelo.provider, stage=etapa, chars=len(texto))
+        _notificar_chamada(modelo, etapa, uso, inicio)
         return texto
     except Exception as exc:
+        _notificar_chamada(modelo, etapa, uso, inicio, erro=str(exc))
         raise RuntimeError(f"Falha ao gerar resposta na IA ({modelo.provider}): {exc}") from exc
+    finally:
+        # Falhas, cancelamentos e respostas vazias tambem consomem tokens do provedor.
+        if enviada:
+            LLM_SCHEDULER.record_tokens(modelo.tenant, _total_tokens(uso, prompt, texto))
 
 
 def listar_modelos() -> List[str]:
@@ -87,26 +152,38 @@ def listar_modelos() -> List[str]:
     return [config.model]
 
 
-def _gerar_resposta_openai(modelo: AISession, prompt: str) -> str:
+def _openai_request(modelo: AISession, prompt: str, stream: bool) -> requests.Response:
     if not modelo.openai_api_key or not modelo.openai_base_url:
         raise RuntimeError("Sessao OpenAI invalida.")
 
-    url = f"{modelo.openai_base_url}/responses"
+    body: dict[str, Any] = {"model": modelo.model, "input": prompt}
+    if modelo.max_output_tokens:
+        body["max_output_tokens"] = modelo.max_output_tokens
+    if stream:
+        body["stream"] = True
+
     response = requests.post(
-        url,
+        f"{modelo.openai_base_url}/responses",
         headers={
             "Authorization": f"Bearer {modelo.openai_api_key}",
             "Content-Type": "application/json",
         },
-        json={
-            "model": modelo.model,
-            "input": prompt,
-        },
-        timeout=60,
+        json=body,
+        # (conexao, leitura): no streaming o limite de leitura vale por trecho e derruba um stream parado.
+        timeout=(modelo.timeout_seconds, modelo.timeout_seconds),
+        stream=stream,
     )
     if response.status_code >= 400:
-        raise RuntimeError(f"OpenAI HTTP {response.status_code}: {response.text}")
+        detail = response.text
+        response.close()
+        raise RuntimeError(f"OpenAI HTTP {response.status_code}: {detail}")
+    return response
+
+
+def _gerar_resposta_openai(modelo: AISession, prompt: str, uso: dict[str, int]) -> str:
+    response = _openai_request(modelo, prompt, stream=False)
     payload: dict[str, Any] = response.json()
+    _uso_openai(payload.get("usage"), uso)
 
     direct_output = (payload.get("output_text") or "").strip()
     if direct_output:
@@ -120,3 +197,158 @@ def _gerar_resposta_openai(modelo: AISession, prompt: str) -> str:
             if isinstance(text, str) and text.strip():
                 parts.append(text.strip())
     return "\n".join(parts).strip()
+
+
+def _gerar_resposta_openai_stream(
+    modelo: AISession,
+    prompt: str,
+    parar_apos_codigo: bool,
+    uso: dict[str, int],
+) -> str:
+    response = _openai_request(modelo, prompt, stream=True)
+    try:
+        return _consumir_stream(_openai_deltas(response, uso), modelo, parar_apos_codigo)
+    except requests.exceptions.RequestException as exc:
+        # Leitura parada alem do limite chega aqui como ReadTimeout/ConnectionError do urllib3.
+        raise RuntimeError(f"Stream OpenAI sem dados por {modelo.timeout_seconds:g}s: {exc}") from exc
+    finally:
+        # Fechar a conexao cancela a geracao restante no servidor.
+        response.close()
+
+
+def _openai_deltas(response: requests.Response, uso: dict[str, int]) -> Iterable[str]:
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            # Keep-alive tambem passa pelo prazo de `_consumir_stream`.
+            yield ""
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        try:
+            event = json.loads(data)
+        except json.JSONDecodeError:
+            continue
+        event_type = event.get("type")
+        if event_type == "response.output_text.delta":
+            yield event.get("delta") or ""
+        elif event_type in {"response.completed", "response.incomplete"}:
+            _uso_openai((event.get("response") or {}).get("usage"), uso)
+            return
+        elif event_type in {"response.failed", "error"}:
+            raise RuntimeError(f"OpenAI stream falhou: {data}")
+
+
+def _gemini_config(modelo: AISession) -> dict[str, Any]:
+    # Timeout HTTP do SDK em milissegundos; no streaming vale por leitura, entao um stream parado tambem estoura.
+    config: dict[str, Any] = {"http_options": {"timeout": int(modelo.timeout_seconds * 1000)}}
+    if modelo.max_output_tokens:
+        config["max_output_tokens"] = modelo.max_output_tokens
+    return config
+
+
+def _gerar_resposta_gemini_stream(
+    modelo: AISession,
+    prompt: str,
+    parar_apos_codigo: bool,
+    uso: dict[str, int],
+) -> str:
+    chunks = modelo.gemini_client.models.generate_content_stream(
+        model=modelo.model,
+        contents=prompt,
+        config=_gemini_config(modelo),
+    )
+
+    def _deltas() -> Iterable[str]:
+        for chunk in chunks:
+            _uso_gemini(chunk, uso)
+            yield chunk.text or ""
+
+    deltas = _deltas()
+    try:
+        return _consumir_stream(deltas, modelo, parar_apos_codigo)
+    finally:
+        deltas.close()
+
+
+def _checar_cancelamento(modelo: AISession) -> None:
+    if modelo.cancel_event is not None and modelo.cancel_event.is_set():
+        raise RuntimeError("Chamada de IA cancelada.")
+
+
+def _consumir_stream(deltas: Iterable[str], modelo: AISession, parar_apos_codigo: bool) -> str:
+    timeout_seconds = modelo.timeout_seconds
+    deadline = time.monotonic() + timeout_seconds
+    parts: list[str] = []
+    for delta in deltas:
+        _checar_cancelamento(modelo)
+        parts.append(delta)
+        if parar_apos_codigo and "`" in delta:
+            texto = "".join(parts)
+            if CODE_FENCE_PATTERN.search(texto):
+                return texto.strip()
+        if time.monotonic() > deadline:
+            texto = "".join(parts)
+            if parar_apos_codigo and CODE_FENCE_PATTERN.search(texto):
+                return texto.strip()
+            raise RuntimeError(f"Tempo limite de {timeout_seconds:g}s excedido durante streaming.")
+    return "".join(parts).strip()
+
+
+def _uso_openai(usage: dict[str, Any] | None, uso: dict[str, int]) -> None:
+    if not isinstance(usage, dict):
+        return
+    uso["prompt_tokens"] = int(usage.get("input_tokens") or 0)
+    uso["completion_tokens"] = int(usage.get("output_tokens") or 0)
+    details = usage.get("input_tokens_details") or {}
+    uso["cached_tokens"] = int(details.get("cached_tokens") or 0)
+
+
+def _uso_gemini(resposta: Any, uso: dict[str, int]) -> None:
+    metadata = getattr(resposta, "usage_metadata", None)
+    if metadata is None or getattr(metadata, "prompt_token_count", None) is None:
+        return
+    # No streaming o ultimo chunk traz o total acumulado.
+    uso["prompt_tokens"] = int(metadata.prompt_token_count or 0)
+    uso["completion_tokens"] = int(getattr(metadata, "candidates_token_count", 0) or 0)
+    uso["cached_tokens"] = int(getattr(metadata, "cached_content_token_count", 0) or 0)
+
+
+def _total_tokens(uso: dict[str, int], prompt: str, texto: str) -> int:
+    if uso:
+        return uso.get("prompt_tokens", 0) + uso.get("completion_tokens", 0)
+    # Stream interrompido antes do evento final: estimativa de ~4 caracteres por token.
+    return (len(prompt) + len(texto)) // 4
+
+
+def _notificar_chamada(
+    modelo: AISession,
+    etapa: str,
+    uso: dict[str, int],
+    inicio: float,
+    erro: str | None = None,
+) -> None:
+    duracao = time.monotonic() - inicio
+    EXTERNAL_CALL_SECONDS.labels(
+        service=f"llm:{modelo.provider}",
+        operation=etapa,
+        outcome="success" if erro is None else "error",
+    ).observe(duracao)
+    if modelo.on_llm_call is None:
+        return
+    registro = LLMCallRecord(
+        stage=etapa,
+        provider=modelo.provider,
+        model=modelo.model,
+        prompt_tokens=uso.get("prompt_tokens", 0),
+        completion_tokens=uso.get("completion_tokens", 0),
+        cached_tokens=uso.get("cached_tokens", 0),
+        latency_ms=int(duracao * 1000),
+        success=erro is None,
+        error=erro,
+    )
+    try:
+        modelo.on_llm_call(registro)
+    except Exception as exc:
+        # Contabilidade nunca deve derrubar a geracao.
+        log_event(logger, logging.WARNING, "llm_call_record_failed", stage=etapa, error=str(exc))
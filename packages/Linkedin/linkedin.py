@@ -3,10 +3,13 @@ from .src.postLinkedin import postar_no_linkedin
 from .src.utils import json_data, ler_json
 
 from datetime import datetime
+import logging
 import requests
 from dotenv import load_dotenv
 import os
 import urllib.parse
+
+from packages.shared import log_event
 
 # todo client id e secret estaram no .env
 load_dotenv()
@@ -15,6 +18,7 @@ client_id = os.getenv("client_id")
 client_secret = os.getenv("client_secret")
 redirect_uri = os.getenv("redirect_uri")
 LINKEDIN_TIMEOUT_SECONDS = 30
+logger = logging.getLogger("autofeedr.linkedin")
 
 def _validar_ambiente_linkedin() -> None:
     faltantes = []
@@ -42,7 +46,6 @@ def gerar_url_para_token():
 
     # Codificar e gerar a URL final
     url = f"{base_url}?{urllib.parse.urlencode(params)}"
-    print("URL de autorizacao do LinkedIn gerada.")
     return url
 
 
@@ -51,7 +54,7 @@ def gerar_token_api(usuario, codigo):
     
     try:
         _validar_ambiente_linkedin()
-        print(f"Gerando token de acesso para usuario: {usuario}")
+        log_event(logger, logging.DEBUG, "linkedin_token_for_user", usuario=usuario)
         token = gerar_token(client_id, client_secret, codigo, redirect_uri)
         if not token:
             raise RuntimeError("Nao foi possivel gerar token para o usuario informado.")
@@ -59,17 +62,17 @@ def gerar_token_api(usuario, codigo):
         data = {usuario: {'token': token, 'DataToken': datetime.now().strftime("%d/%m/%Y %H:%M:%S")}}
 
         json_data(data)
-        print("Token salvo com sucesso.")
+        log_event(logger, logging.INFO, "linkedin_token_saved", usuario=usuario)
         return True
     
     except Exception as e:
-        print("Erro ao gerar token:", e)
+        log_event(logger, logging.ERROR, "linkedin_token_for_user_failed", usuario=usuario, error=str(e))
         raise e
 
 
 def gerar_urn(usuario):
     try:
-        print(f"Buscando URN para usuario: {usuario}")
+        log_event(logger, logging.DEBUG, "linkedin_urn_for_user", usuario=usuario)
         dados = ler_json()
         if usuario not in dados or "token" not in dados[usuario]:
             raise KeyError(f"Token nao encontrado para usuario '{usuario}' em dados.json.")
@@ -89,22 +92,21 @@ def gerar_urn(usuario):
         data = {usuario: {'urn': urn}}
 
         json_data(data)
-        print("URN salvo com sucesso.")
+        log_event(logger, logging.INFO, "linkedin_urn_saved", usuario=usuario)
 
         return True
     
     except Exception as e:
-        print("Erro ao gerar urn:", e)
+        log_event(logger, logging.ERROR, "linkedin_urn_for_user_failed", usuario=usuario, error=str(e))
         raise e
 
 def FazerPost(texto, usuario):
 
-    print(f"Publicando post para usuario: {usuario}")
     if not texto:
-        print("Texto vazio. Publicacao cancelada.")
+        log_event(logger, logging.WARNING, "linkedin_post_skipped", usuario=usuario, reason="empty")
         return False
     if len(texto) > 3000:
-        print(f"Texto excede 3000 caracteres ({len(texto)}). Publicacao cancelada.")
+        log_event(logger, logging.WARNING, "linkedin_post_skipped", usuario=usuario, reason="too_long", chars=len(texto))
         return False
     dados = ler_json()
     if usuario not in dados:
@@ -1,5 +1,11 @@
+import logging
+
 import requests
+
+from packages.shared import log_event
+
 LINKEDIN_TIMEOUT_SECONDS = 30
+logger = logging.getLogger("autofeedr.linkedin.token")
 
 
 def gerar_token(client_id, client_secret, code, redirect_uri):
@@ -13,21 +19,20 @@ def gerar_token(client_id, client_secret, code, redirect_uri):
         "client_secret": client_secret
     }
 
-    print("Solicitando token de acesso 🔑")
+    log_event(logger, logging.DEBUG, "linkedin_token_request")
     try:
         resp = requests.post(url, data=data, timeout=LINKEDIN_TIMEOUT_SECONDS)
     except requests.RequestException as exc:
-        print(f"Falha de rede ao solicitar token: {exc}")
+        log_event(logger, logging.WARNING, "linkedin_token_network_error", error=str(exc))
         return None
-    print("Resposta do LinkedIn recebida.")
 
     if resp.status_code == 200:
         token = resp.json()["access_token"]
         expires = resp.json()["expires_in"]
-        print(f"Token gerado com sucesso 🎉 expira em {expires/3600/24:.1f} dias")
+        log_event(logger, logging.INFO, "linkedin_token_generated", expires_in_days=round(expires / 3600 / 24, 1))
         return token
     else:
-        print(f"Erro ({resp.status_code}): {resp.text}")
+        log_event(logger, logging.WARNING, "linkedin_token_failed", status=resp.status_code, body=resp.text[:500])
         return None
 
 if __name__ == "__main__":
@@ -1,14 +1,119 @@
 import requests
 import logging
-from datetime import datetime, timedelta
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s — %(levelname)s — %(message)s 💬')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+import os
+import threading
+from datetime import UTC, datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+from requests.adapters import HTTPAdapter
+
+from packages.shared import log_event
+
+# Sem handler proprio: os registros seguem para o logging raiz configurado em `configure_logging`.
+logger = logging.getLogger("autofeedr.linkedin.post")
 LINKEDIN_TIMEOUT_SECONDS = 30
+LINKEDIN_CONNECT_TIMEOUT_SECONDS = 5
 MAX_LINKEDIN_POST_CHARS = 3000
+DEFAULT_RETRY_AFTER_SECONDS = 300
+# 4xx que nao mudam com nova tentativa: token expirado/revogado, sem permissao, payload ou conteudo duplicado.
+PERMANENT_STATUS = {400, 401, 403, 404, 409, 410, 422}
+
+
+class LinkedInPostError(RuntimeError):
+    """Falha ao publicar; `permanent` indica que repetir nao adianta e `retry_at` vem do `Retry-After`."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: int | None = None,
+        permanent: bool = False,
+        retry_at: datetime | None = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.permanent = permanent
+        self.retry_at = retry_at
+
+
+class LinkedInRateLimited(LinkedInPostError):
+    """HTTP 429: o job deve ser adiado ate `retry_at` sem gastar tentativa."""
+
+    def __init__(self, message: str, retry_at: datetime):
+        super().__init__(message, status_code=429, retry_at=retry_at)
+
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        value = float((os.getenv(name) or "").strip())
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _api_base_url() -> str:
+    return (os.getenv("LINKEDIN_API_BASE_URL") or "https://api.linkedin.com").strip().rstrip("/")
+
+
+def _get_session() -> requests.Session:
+    """Sessao HTTP compartilhada: reaproveita conexoes TLS com a API entre publicacoes."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            pool_size = int(_env_float("LINKEDIN_POOL_SIZE", 4))
+            # Sem retry automatico do urllib3: repetir um POST pode duplicar o post.
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _parse_retry_after(value: str | None) -> datetime | None:
+    """`Retry-After` em segundos ou data HTTP; devolve o instante em UTC."""
+    if not value:
+        return None
+    value = value.strip()
+    now = datetime.now(UTC)
+    if value.isdigit():
+        return now + timedelta(seconds=int(value))
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return max(parsed, now)
+
+
+def _classify_failure(resp: requests.Response) -> LinkedInPostError:
+    status = resp.status_code
+    body = resp.text[:500]
+    retry_at = _parse_retry_after(resp.headers.get("Retry-After"))
+    if status == 429:
+        retry_at = retry_at or datetime.now(UTC) + timedelta(seconds=DEFAULT_RETRY_AFTER_SECONDS)
+        return LinkedInRateLimited(
+            f"LinkedIn limitou as publicacoes (429). Nova tentativa em {retry_at.isoformat(timespec='seconds')}.",
+            retry_at=retry_at,
+        )
+    if status in PERMANENT_STATUS:
+        if status == 401:
+            reason = "token expirado ou revogado"
+        elif "duplicate" in body.lower():
+            reason = "conteudo duplicado"
+        else:
+            reason = "requisicao recusada"
+        return LinkedInPostError(
+            f"Erro permanente ao postar ({status}, {reason}) - resposta: {body}",
+            status_code=status,
+            permanent=True,
+        )
+    return LinkedInPostError(f"Erro ao postar ({status}) - resposta: {body}", status_code=status, retry_at=retry_at)
+
 
 def postar_no_linkedin(token, author_urn, texto):
     if not token:
@@ -27,7 +132,7 @@ def postar_no_linkedin(token, author_urn, texto):
     Ano_Mes_Anterior = (datetime.now() - timedelta(days=30)).strftime("%Y%m")
 
 
-    url = "https://api.linkedin.com/v2/ugcPosts"
+    url = f"{_api_base_url()}/v2/ugcPosts"
     headers = {
         "Authorization": f"Bearer {token}",
         "LinkedIn-Version": f"{Ano_Mes_Anterior}",
@@ -48,25 +153,30 @@ def postar_no_linkedin(token, author_urn, texto):
             }
         }
 
-    print("Enviando post para o LinkedIn...")
+    log_event(logger, logging.DEBUG, "linkedin_post_request", author_urn=author_urn, chars=len(texto))
+    timeout = (
+        _env_float("LINKEDIN_CONNECT_TIMEOUT_SECONDS", LINKEDIN_CONNECT_TIMEOUT_SECONDS),
+        _env_float("LINKEDIN_TIMEOUT_SECONDS", LINKEDIN_TIMEOUT_SECONDS),
+    )
     try:
-        resp = requests.post(
-            url,
-            headers=headers,
-            json=data,
-            timeout=LINKEDIN_TIMEOUT_SECONDS,
-        )
+        resp = _get_session().post(url, headers=headers, json=data, timeout=timeout)
     except requests.RequestException as exc:
-        raise RuntimeError(f"Falha de rede ao postar no LinkedIn: {exc}") from exc
+        raise LinkedInPostError(f"Falha de rede ao postar no LinkedIn: {exc}") from exc
     if resp.status_code in (200, 201):
-        print(f"URN do autor: {author_urn}")
-        print("Post publicado com sucesso 🎉")
+        log_event(logger, logging.INFO, "linkedin_post_published", author_urn=author_urn)
         return True
-    else:
-        print(f"Erro ao postar ({resp.status_code}): {resp.text}")
-        raise RuntimeError(
-            f"Erro ao postar ({resp.status_code}) - resposta: {resp.text}"
-        )
+
+    error = _classify_failure(resp)
+    log_event(
+        logger,
+        logging.WARNING,
+        "linkedin_post_failed",
+        status=resp.status_code,
+        permanent=error.permanent,
+        retry_at=error.retry_at,
+        body=resp.text[:500],
+    )
+    raise error
 
 if __name__ == "__main__":
     pass
@@ -1,6 +1,11 @@
 import json
+import logging
 import os
 
+from packages.shared import log_event
+
+logger = logging.getLogger("autofeedr.linkedin.utils")
+
 def atualizar_dict_recursivo(destino, origem):
     """Atualiza um dicionário de forma recursiva, sem sobrescrever subníveis inteiros."""
     for chave, valor in origem.items():
@@ -15,7 +20,6 @@ def json_data(novos_dados, nome_arquivo="dados.json"):
     atualizando apenas o que foi passado.
     """
     try:
-        print(f"Atualizando arquivo JSON: {nome_arquivo}")
         if os.path.exists(nome_arquivo):            
             with open(nome_arquivo, "r", encoding="utf-8") as f:
                 dados = json.load(f)
@@ -30,23 +34,22 @@ def json_data(novos_dados, nome_arquivo="dados.json"):
 
         with open(nome_arquivo, "w", encoding="utf-8") as f:
             json.dump(dados, f, ensure_ascii=False, indent=4)
-        print("Arquivo JSON atualizado com sucesso.")
+        log_event(logger, logging.DEBUG, "json_file_updated", path=nome_arquivo)
         
     except Exception as e:
-        print(f"Falha ao atualizar JSON '{nome_arquivo}': {e}")
+        log_event(logger, logging.ERROR, "json_file_update_failed", path=nome_arquivo, error=str(e))
         raise
 
 def ler_json(nome_arquivo="dados.json"):
     """Lê o arquivo JSON e retorna os dados. Se não existir, retorna um dicionário vazio."""
     if not os.path.exists(nome_arquivo):
-        print(f"Arquivo JSON nao encontrado: {nome_arquivo}")
+        log_event(logger, logging.DEBUG, "json_file_missing", path=nome_arquivo)
         return {}
 
     with open(nome_arquivo, "r", encoding="utf-8") as f:
         try:
             data = json.load(f)
-            print(f"Arquivo JSON carregado: {nome_arquivo}")
             return data
         except json.JSONDecodeError:
-            print(f"Arquivo JSON invalido: {nome_arquivo}")
+            log_event(logger, logging.WARNING, "json_file_invalid", path=nome_arquivo)
             return {}
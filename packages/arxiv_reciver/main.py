@@ -1,18 +1,21 @@
 import json
+import logging
 from pathlib import Path
 from datetime import datetime
 import os
 
+from packages.shared import log_event
+
 from .src.article_receiver import fetch_articles_by_topics
 
 DATA_DIR = Path("data")
 TEMP_OUTPUT = DATA_DIR / "temp_article.json"
+logger = logging.getLogger("autofeedr.arxiv")
 
 def get_article(topics: list[str], start: str = None, end: str = None, per_topic: int = 2, save_in_file: bool = False) -> dict:
     # Roteia a consulta com ou sem intervalo de datas.
-    print(f"Buscando artigos para topics={topics} per_topic={per_topic} save_in_file={save_in_file}")
+    log_event(logger, logging.DEBUG, "arxiv_get_article", topics=topics, per_topic=per_topic, start=start, end=end)
     if start and end:
-        print(f"Usando intervalo de datas: {start} ate {end}")
         results = fetch_articles_by_topics(
             topics=topics,
             start_date=start,
@@ -20,20 +23,16 @@ def get_article(topics: list[str], start: str = None, end: str = None, per_topic
             per_topic=per_topic,
         )
     else:
-        print("Usando intervalo padrao (dia anterior em UTC).")
         results = fetch_articles_by_topics(
             topics=topics,
             per_topic=per_topic,
         )
 
     if save_in_file:
-        print(f"Salvando resultados em {TEMP_OUTPUT}")
+        log_event(logger, logging.DEBUG, "arxiv_results_saved", path=str(TEMP_OUTPUT))
         DATA_DIR.mkdir(parents=True, exist_ok=True)
-        TEMP_OUTPUT.write_text(
-            json.dumps(results, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
-    print("Busca concluida.")
+        with TEMP_OUTPUT.open("w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2, ensure_ascii=False)
     return results
     
 
@@ -50,7 +49,5 @@ if __name__ == "__main__":
     )
 
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    TEMP_OUTPUT.write_text(
-        json.dumps(results, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
+    with TEMP_OUTPUT.open("w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2, ensure_ascii=False)
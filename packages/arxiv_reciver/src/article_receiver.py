@@ -6,15 +6,32 @@ consultas e o parsing dos resultados.
 """
 from __future__ import annotations
 
-from dataclasses import asdict
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import UTC, datetime, timedelta, time
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import arxiv
 
+from packages.shared import log_event
+
+from ..src.rate_limiter import limiter_from_env
 from ..src.schema import ArxivArticle
 
-ARXIV_CLIENT = arxiv.Client()
+logger = logging.getLogger("autofeedr.arxiv.receiver")
+ARXIV_RATE_LIMITER = limiter_from_env()
+# O espacamento entre requisicoes e feito pelo limitador; o delay do client cobre so paginas extras.
+ARXIV_CLIENT = arxiv.Client(delay_seconds=ARXIV_RATE_LIMITER.min_interval_seconds)
+
+
+def _max_workers() -> int:
+    raw = (os.getenv("ARXIV_MAX_WORKERS") or "").strip()
+    try:
+        return max(int(raw), 1) if raw else 4
+    except ValueError:
+        return 4
 
 
 def _normalize_topics(topics: Iterable[str]) -> List[str]:
@@ -22,7 +39,7 @@ def _normalize_topics(topics: Iterable[str]) -> List[str]:
         raise ValueError("A lista de assuntos não pode ser vazia.")
 
     normalized = [topic.strip() for topic in topics if topic and topic.strip()]
-    print(f"Topics normalizados: {normalized}")
+    log_event(logger, logging.DEBUG, "arxiv_topics_normalized", topics=normalized)
     if not normalized:
         raise ValueError("Todos os assuntos informados são vazios ou inválidos.")
     return normalized
@@ -52,13 +69,28 @@ def _build_date_range(start_date: datetime, end_date: datetime) -> str:
         raise ValueError("A data inicial deve ser anterior ou igual à data final.")
     return f"submittedDate:[{_format_date_for_query(start_date)} TO {_format_date_for_query(end_date)}]"
 
+def _combined_query_enabled() -> bool:
+    return (os.getenv("ARXIV_COMBINED_QUERY") or "false").strip().lower() in {"1", "true", "yes"}
+
 def _search_topic(
     topic: str,
     date_constraint: str,
     max_results: int,
 ) -> List[ArxivArticle]:
-    search_query = f"all:{topic} AND {date_constraint}"
-    print(f"Consultando arXiv: {search_query} (max_results={max_results})")
+    return _run_search(f"all:{topic} AND {date_constraint}", max_results)
+
+def _to_article(result: arxiv.Result) -> ArxivArticle:
+    return ArxivArticle(
+        title=result.title,
+        summary=result.summary,
+        authors=[author.name for author in result.authors],
+        published=result.published,
+        updated=result.updated,
+        url=result.entry_id,
+    )
+
+def _run_search(search_query: str, max_results: int) -> List[ArxivArticle]:
+    log_event(logger, logging.DEBUG, "arxiv_query", query=search_query, max_results=max_results)
     search = arxiv.Search(
         query=search_query,
         max_results=max_results,
@@ -66,36 +98,99 @@ def _search_topic(
         sort_order=arxiv.SortOrder.Descending,
     )
 
-    articles: List[ArxivArticle] = []
-    for result in ARXIV_CLIENT.results(search):
-        articles.append(
-            ArxivArticle(
-                title=result.title,
-                summary=result.summary,
-                authors=[author.name for author in result.authors],
-                published=result.published,
-                updated=result.updated,
-                url=result.entry_id,
-            )
-        )
-    return articles
+    ARXIV_RATE_LIMITER.acquire()
+    return [_to_article(result) for result in ARXIV_CLIENT.results(search)]
+
+def fetch_article_by_id(arxiv_id: str) -> Optional[ArxivArticle]:
+    """Busca um artigo pelo id do arXiv usando o client e o limitador compartilhados."""
+    search = arxiv.Search(id_list=[arxiv_id], max_results=1)
+    ARXIV_RATE_LIMITER.acquire()
+    result = next(ARXIV_CLIENT.results(search), None)
+    return _to_article(result) if result else None
+
+def search_articles(topic: str, start_date: datetime, end_date: datetime, max_results: int) -> List[ArxivArticle]:
+    """Busca os artigos mais recentes de um tema dentro da janela informada."""
+    return _search_topic(topic.strip(), _build_date_range(start_date, end_date), max_results)
+
+def serialize_article(article: ArxivArticle) -> Dict[str, Any]:
+    # Montado direto: `asdict` copia recursivamente cada campo e e o ponto caro com muitos artigos.
+    return {
+        "title": article.title,
+        "summary": article.summary,
+        "authors": list(article.authors),
+        "published": article.published.isoformat(),
+        "updated": article.updated.isoformat(),
+        "url": article.url,
+    }
 
 def _serialize_results(results: Dict[str, List[ArxivArticle]]) -> Dict[str, Any]:
-    serialized: Dict[str, Any] = {}
-    for topic, articles in results.items():
-        serialized[topic] = []
-        for article in articles:
-            article_dict = asdict(article)
-            article_dict["published"] = article.published.isoformat()
-            article_dict["updated"] = article.updated.isoformat()
-            serialized[topic].append(article_dict)
-    return serialized
+    return {topic: [serialize_article(article) for article in articles] for topic, articles in results.items()}
+
+def _topic_terms(topic: str) -> List[str]:
+    return [term for term in re.findall(r"\w+", topic.lower()) if term]
+
+def _matches_topic(article: ArxivArticle, terms: List[str]) -> bool:
+    text = f"{article.title} {article.summary}".lower()
+    return all(re.search(rf"\b{re.escape(term)}", text) for term in terms)
+
+def _search_topics_combined(
+    topics: List[str],
+    date_constraint: str,
+    per_topic: int,
+) -> Dict[str, List[ArxivArticle]]:
+    """
+    Faz uma unica consulta `(all:a) OR (all:b) ...` e devolve os artigos a cada tema
+    pelos termos encontrados no titulo/resumo. Temas sem correspondencia voltam vazios.
+    """
+    topics_clause = " OR ".join(f"(all:{topic})" for topic in topics)
+    # Janela maior que per_topic * temas para sobrar artigo apos a separacao.
+    max_results = min(per_topic * len(topics) * 3, 300)
+    articles = _run_search(f"({topics_clause}) AND {date_constraint}", max_results)
+
+    catalog: Dict[str, List[ArxivArticle]] = {topic: [] for topic in topics}
+    terms_by_topic = {topic: _topic_terms(topic) for topic in topics}
+    for article in articles:
+        for topic in topics:
+            if len(catalog[topic]) < per_topic and _matches_topic(article, terms_by_topic[topic]):
+                catalog[topic].append(article)
+    return catalog
+
+def iter_articles_by_topics(
+    topics: List[str],
+    date_constraint: str,
+    per_topic: int,
+) -> Iterator[Tuple[str, List[ArxivArticle]]]:
+    """Busca os temas em paralelo e entrega cada `(tema, artigos)` assim que termina."""
+    if len(topics) == 1:
+        yield topics[0], _search_topic(topics[0], date_constraint, per_topic)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(len(topics), _max_workers()))
+    try:
+        futures = {executor.submit(_search_topic, topic, date_constraint, per_topic): topic for topic in topics}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def resolve_date_window(
+    start_date: Optional[datetime | str] = None,
+    end_date: Optional[datetime | str] = None,
+    reference: Optional[datetime] = None,
+) -> Tuple[datetime, datetime]:
+    """Resolve a janela de busca; sem datas usa o dia anterior inteiro (UTC) a `reference` (padrao: agora)."""
+    now_utc = reference.astimezone(UTC) if reference else datetime.now(UTC)
+    previous_day = (now_utc - timedelta(days=1)).date()
+    default_start = datetime.combine(previous_day, time.min, tzinfo=UTC)
+    default_end = datetime.combine(previous_day, time.max, tzinfo=UTC)
+    return _ensure_datetime(start_date, default_start), _ensure_datetime(end_date, default_end)
 
 def fetch_articles_by_topics(
     topics: Iterable[str],
     start_date: Optional[datetime | str] = None,
     end_date: Optional[datetime | str] = None,
     per_topic: int = 5,
+    combined_query: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """
     Consulta o arXiv por uma lista de temas e retorna artigos agrupados por assunto.
@@ -105,6 +200,8 @@ def fetch_articles_by_topics(
         start_date: data inicial (datetime ou string ISO). Padrão: início do dia anterior (UTC).
         end_date: data final (datetime ou string ISO). Padrão: final do dia anterior (UTC).
         per_topic: quantidade máxima de artigos por assunto.
+        combined_query: com mais de um tema, faz uma consulta única com OR e só repete
+            por tema os que ficarem sem artigos. Padrão: variável ARXIV_COMBINED_QUERY.
 
     Returns:
         Dicionário com o tema como chave e a lista de artigos como valor.
@@ -112,21 +209,20 @@ def fetch_articles_by_topics(
     """
     normalized_topics = _normalize_topics(topics)
 
-    # Define intervalo padrao (dia anterior) quando datas nao sao informadas.
-    now_utc = datetime.now(UTC)
-    previous_day = (now_utc - timedelta(days=1)).date()
-    default_start = datetime.combine(previous_day, time.min, tzinfo=UTC)
-    default_end = datetime.combine(previous_day, time.max, tzinfo=UTC)
-
-    resolved_end = _ensure_datetime(end_date, default_end)
-    resolved_start = _ensure_datetime(start_date, default_start)
+    resolved_start, resolved_end = resolve_date_window(start_date, end_date)
 
     date_constraint = _build_date_range(resolved_start, resolved_end)
-    print(f"Intervalo de consulta: {resolved_start.isoformat()} ate {resolved_end.isoformat()}")
-
-    catalog: Dict[str, List[ArxivArticle]] = {}
-    for topic in normalized_topics:
-        catalog[topic] = _search_topic(topic, date_constraint, per_topic)
+    log_event(logger, logging.DEBUG, "arxiv_window", start=resolved_start, end=resolved_end)
+
+    use_combined = _combined_query_enabled() if combined_query is None else combined_query
+    if use_combined and len(normalized_topics) > 1:
+        fetched = _search_topics_combined(normalized_topics, date_constraint, per_topic)
+        missing = [topic for topic in normalized_topics if not fetched[topic]]
+        if missing:
+            fetched.update(iter_articles_by_topics(missing, date_constraint, per_topic))
+    else:
+        fetched = dict(iter_articles_by_topics(normalized_topics, date_constraint, per_topic))
+    catalog: Dict[str, List[ArxivArticle]] = {topic: fetched[topic] for topic in normalized_topics}
     serialized_results = _serialize_results(catalog)
     serialized_results["intervalo_consulta"] = {
         "inicio": resolved_start.isoformat(),
@@ -0,0 +1,84 @@
+"""
+Monta o texto de entrada do LLM a partir de artigos do arXiv dentro de um orcamento de tokens.
+
+Em vez do `str()` de dicionarios com resumo e lista de autores completos, cada artigo vira
+um bloco curto: autores limitados, data sem horario e o resumo cortado em fim de frase
+quando passa do espaco disponivel.
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterable, List
+
+from .schema import ArxivArticle
+
+CHARS_PER_TOKEN = 4
+MAX_AUTHORS = 3
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa de ~4 caracteres por token, a mesma usada no Escritor."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _compact(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _format_authors(authors: List[str]) -> str:
+    if len(authors) <= MAX_AUTHORS:
+        return ", ".join(authors)
+    return f"{', '.join(authors[:MAX_AUTHORS])} et al."
+
+
+def truncate_summary(summary: str, max_chars: int) -> str:
+    """Corta o resumo em fim de frase; sem frase que caiba, corta na ultima palavra."""
+    summary = _compact(summary)
+    if max_chars <= 0:
+        return ""
+    if len(summary) <= max_chars:
+        return summary
+
+    kept = ""
+    for sentence in _SENTENCE_END.split(summary):
+        candidate = f"{kept} {sentence}".strip()
+        if len(candidate) > max_chars:
+            break
+        kept = candidate
+    if kept:
+        return kept
+    return summary[: max(max_chars - 3, 0)].rsplit(" ", 1)[0] + "..."
+
+
+def _header(article: ArxivArticle) -> str:
+    return (
+        f"Title: {_compact(article.title)}\n"
+        f"Authors: {_format_authors(article.authors)}\n"
+        f"Published: {article.published.date().isoformat()}\n"
+        f"URL: {article.url}\n"
+    )
+
+
+def build_article_prompt(articles: Iterable[ArxivArticle], token_budget: int = 0) -> str:
+    """
+    Texto compacto dos artigos para o prompt.
+
+    Args:
+        articles: artigos na ordem de prioridade.
+        token_budget: limite aproximado de tokens do texto inteiro; `0` mantem os resumos completos.
+    """
+    articles = list(articles)
+    if not articles:
+        return ""
+    headers = [_header(article) for article in articles]
+    summary_chars = 0
+    if token_budget > 0:
+        header_chars = sum(len(header) for header in headers) + len("Summary: \n\n") * len(articles)
+        summary_chars = max(token_budget * CHARS_PER_TOKEN - header_chars, 0) // len(articles)
+
+    blocks = []
+    for article, header in zip(articles, headers):
+        summary = truncate_summary(article.summary, summary_chars) if token_budget > 0 else _compact(article.summary)
+        blocks.append(f"{header}Summary: {summary}\n" if summary else header)
+    return "\n".join(blocks)
@@ -0,0 +1,73 @@
+"""
+Limitador de taxa para a API do arXiv, compartilhado entre threads e processos.
+
+A politica do arXiv pede no maximo uma requisicao a cada ~3 segundos. Dentro do
+processo um lock serializa as reservas; entre processos (API e worker na mesma
+maquina) o horario da proxima requisicao permitida fica num arquivo protegido
+por `flock`.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows usa so o lock local
+    fcntl = None
+
+
+class ArxivRateLimiter:
+    def __init__(self, min_interval_seconds: float = 3.0, lock_file: str | Path | None = None):
+        self.min_interval_seconds = max(min_interval_seconds, 0.0)
+        self.lock_file = Path(lock_file) if lock_file else None
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+
+    def acquire(self) -> None:
+        """Bloqueia ate a vez desta requisicao."""
+        with self._lock:
+            slot = self._reserve_shared() if self.lock_file and fcntl else self._reserve_local()
+        delay = slot - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _reserve_local(self) -> float:
+        slot = max(time.time(), self._next_allowed)
+        self._next_allowed = slot + self.min_interval_seconds
+        return slot
+
+    def _reserve_shared(self) -> float:
+        self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_file, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                raw = handle.read().strip()
+                try:
+                    next_allowed = float(raw) if raw else 0.0
+                except ValueError:
+                    next_allowed = 0.0
+                slot = max(time.time(), next_allowed)
+                handle.seek(0)
+                handle.truncate()
+                handle.write(f"{slot + self.min_interval_seconds:.3f}")
+                handle.flush()
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+        return slot
+
+
+def limiter_from_env() -> ArxivRateLimiter:
+    raw_interval = (os.getenv("ARXIV_MIN_INTERVAL_SECONDS") or "").strip()
+    try:
+        interval = float(raw_interval) if raw_interval else 3.0
+    except ValueError:
+        interval = 3.0
+    lock_file = (os.getenv("ARXIV_RATE_LOCK_FILE") or "").strip() or str(
+        Path(tempfile.gettempdir()) / "autofeedr-arxiv-rate.lock"
+    )
+    return ArxivRateLimiter(min_interval_seconds=interval, lock_file=lock_file)
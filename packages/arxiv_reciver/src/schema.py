@@ -3,9 +3,9 @@ from typing import List
 from datetime import datetime
 
 # Estrutura de dados para artigos do arXiv.
-@dataclass
+@dataclass(slots=True)
 class ArxivArticle:
-    """Estrutura básica para representar um artigo retornado pela API."""
+    """Estrutura básica para representar um artigo retornado pela API (com __slots__, sem __dict__ por instância)."""
 
     title: str
     summary: str
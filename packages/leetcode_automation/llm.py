@@ -4,13 +4,22 @@ import json
 import re
 
 from packages.Escritor.src.utils import AISession, conectar_ia, gerar_resposta
-
-from .prompts import PROMPT_FIX_SOLUTION, PROMPT_GENERATE_SOLUTION, PROMPT_GENERATE_TESTS
+from packages.shared import LLMCallCallback
+
+from .prompts import (
+    PROMPT_FIX_SOLUTION,
+    PROMPT_GENERATE_SOLUTION,
+    PROMPT_GENERATE_TESTS,
+    PROMPT_GENERATE_TESTS_FROM_STATEMENT,
+)
 from .types import LeetCodeProblemDetail
 
 
-def get_llm_session(openai_api_key: str | None = None) -> AISession:
-    return conectar_ia(openai_api_key=openai_api_key)
+def get_llm_session(
+    openai_api_key: str | None = None,
+    on_llm_call: LLMCallCallback | None = None,
+) -> AISession:
+    return conectar_ia(openai_api_key=openai_api_key, on_llm_call=on_llm_call)
 
 
 def generate_solution_code(
@@ -32,7 +41,7 @@ def generate_solution_code(
     ai_error = ""
     output = ""
     try:
-        output = gerar_resposta(session, prompt)
+        output = gerar_resposta(session, prompt, parar_apos_codigo=True, etapa="solution")
     except Exception as exc:
         ai_error = str(exc)
     if output:
@@ -45,21 +54,38 @@ def generate_solution_code(
     raise RuntimeError(f"Falha ao gerar solucao Python na IA.{suffix}")
 
 
-def generate_tests_code(session: AISession, problem: LeetCodeProblemDetail, solution_code: str) -> str:
-    prompt = PROMPT_GENERATE_TESTS.format(
-        frontend_id=problem.frontend_id,
-        title=problem.title,
-        difficulty=problem.difficulty,
-        title_slug=problem.title_slug,
-        content=problem.content,
-        sample_test_case=problem.sample_test_case,
-        metadata_json=json.dumps(problem.metadata, ensure_ascii=False, indent=2),
-        solution_code=solution_code,
-    )
+def generate_tests_code(
+    session: AISession,
+    problem: LeetCodeProblemDetail,
+    solution_code: str | None = None,
+) -> str:
+    # Sem solucao, os testes saem apenas do enunciado e podem ser gerados em paralelo.
+    if solution_code is None:
+        prompt = PROMPT_GENERATE_TESTS_FROM_STATEMENT.format(
+            frontend_id=problem.frontend_id,
+            title=problem.title,
+            difficulty=problem.difficulty,
+            title_slug=problem.title_slug,
+            starter_code=problem.starter_code_python or "(empty)",
+            content=problem.content,
+            sample_test_case=problem.sample_test_case,
+            metadata_json=json.dumps(problem.metadata, ensure_ascii=False, indent=2),
+        )
+    else:
+        prompt = PROMPT_GENERATE_TESTS.format(
+            frontend_id=problem.frontend_id,
+            title=problem.title,
+            difficulty=problem.difficulty,
+            title_slug=problem.title_slug,
+            content=problem.content,
+            sample_test_case=problem.sample_test_case,
+            metadata_json=json.dumps(problem.metadata, ensure_ascii=False, indent=2),
+            solution_code=solution_code,
+        )
     ai_error = ""
     output = ""
     try:
-        output = gerar_resposta(session, prompt)
+        output = gerar_resposta(session, prompt, parar_apos_codigo=True, etapa="tests")
     except Exception as exc:
         ai_error = str(exc)
     if output:
@@ -89,7 +115,7 @@ def fix_solution_code(
         failure_output=failure_output,
     )
     try:
-        output = gerar_resposta(session, prompt)
+        output = gerar_resposta(session, prompt, parar_apos_codigo=True, etapa="fix")
     except Exception as exc:
         raise RuntimeError(f"Falha ao corrigir solucao na IA. Causa: {exc}") from exc
     return extract_python_code(output)
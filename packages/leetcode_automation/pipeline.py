@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import contextvars
 import re
-from dataclasses import dataclass
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+
+from packages.Escritor.src.utils import AISession
+from packages.shared import LLMCallCallback, span
+from packages.shared.metrics import observe_external_call
 
 from .git_ops import publish_to_github
 from .llm import (
@@ -12,6 +19,7 @@ from .llm import (
 )
 from .provider import LeetCodeProvider
 from .tester import run_solution_tests
+from .types import GeneratedAssets, LeetCodeProblemDetail, TestRunResult
 
 
 @dataclass
@@ -36,6 +44,10 @@ class LeetCodePipelineInput:
     tmp_root: str
     solution_prompt_template: str | None = None
     openai_api_key: str | None = None
+    parallel_generation: bool = False
+    # So vale com `parallel_generation`; no modo sequencial os testes saem da solucao gerada.
+    solution_candidates: int = 1
+    on_llm_call: LLMCallCallback | None = None
 
 
 @dataclass
@@ -58,31 +70,42 @@ def execute_leetcode_pipeline(payload: LeetCodePipelineInput) -> LeetCodePipelin
         max_retries=3,
     )
 
-    problem = provider.select_problem(
-        selection_strategy=payload.selection_strategy,
-        difficulty_policy=payload.difficulty_policy,
-        completed_frontend_ids=payload.completed_frontend_ids,
-        forced_problem_slug=payload.forced_problem_slug,
-    )
+    with span("select_problem"), observe_external_call("leetcode", "select_problem"):
+        problem = provider.select_problem(
+            selection_strategy=payload.selection_strategy,
+            difficulty_policy=payload.difficulty_policy,
+            completed_frontend_ids=payload.completed_frontend_ids,
+            forced_problem_slug=payload.forced_problem_slug,
+        )
 
-    session = get_llm_session(openai_api_key=payload.openai_api_key)
-    solution_code = generate_solution_code(
-        session,
-        problem,
-        prompt_template=payload.solution_prompt_template,
-    )
-    tests_code = generate_tests_code(session, problem, solution_code)
+    session = get_llm_session(openai_api_key=payload.openai_api_key, on_llm_call=payload.on_llm_call)
+    known_result: TestRunResult | None = None
+    if payload.parallel_generation:
+        assets, known_result = _generate_assets_parallel(session, problem, payload)
+        solution_code = assets.solution_code
+        tests_code = assets.tests_code
+    else:
+        solution_code = generate_solution_code(
+            session,
+            problem,
+            prompt_template=payload.solution_prompt_template,
+        )
+        tests_code = generate_tests_code(session, problem, solution_code)
 
     last_failure = ""
     attempts_used = 0
 
     for attempt in range(1, payload.max_attempts + 1):
         attempts_used = attempt
-        test_result = run_solution_tests(
-            solution_code=solution_code,
-            tests_code=tests_code,
-            timeout_seconds=payload.test_timeout_seconds,
-        )
+        if attempt == 1 and known_result is not None:
+            test_result = known_result
+        else:
+            with span("run_solution_tests", attempt=attempt):
+                test_result = run_solution_tests(
+                    solution_code=solution_code,
+                    tests_code=tests_code,
+                    timeout_seconds=payload.test_timeout_seconds,
+                )
         if test_result.success:
             break
 
@@ -104,22 +127,23 @@ def execute_leetcode_pipeline(payload: LeetCodePipelineInput) -> LeetCodePipelin
         )
 
     filename = _build_solution_filename(problem.frontend_id, problem.title_slug)
-    publish_result = publish_to_github(
-        repo_ssh_url=payload.repo_ssh_url,
-        default_branch=payload.default_branch,
-        solutions_dir=payload.solutions_dir,
-        problem_question_id=problem.question_id,
-        problem_slug=problem.title_slug,
-        problem_title=problem.title,
-        problem_difficulty=problem.difficulty,
-        filename=filename,
-        solution_code=solution_code,
-        commit_author_name=payload.commit_author_name,
-        commit_author_email=payload.commit_author_email,
-        ssh_private_key=payload.ssh_private_key,
-        ssh_passphrase=payload.ssh_passphrase,
-        tmp_root=payload.tmp_root,
-    )
+    with span("publish_to_github"), observe_external_call("github", "publish"):
+        publish_result = publish_to_github(
+            repo_ssh_url=payload.repo_ssh_url,
+            default_branch=payload.default_branch,
+            solutions_dir=payload.solutions_dir,
+            problem_question_id=problem.question_id,
+            problem_slug=problem.title_slug,
+            problem_title=problem.title,
+            problem_difficulty=problem.difficulty,
+            filename=filename,
+            solution_code=solution_code,
+            commit_author_name=payload.commit_author_name,
+            commit_author_email=payload.commit_author_email,
+            ssh_private_key=payload.ssh_private_key,
+            ssh_passphrase=payload.ssh_passphrase,
+            tmp_root=payload.tmp_root,
+        )
 
     return LeetCodePipelineResult(
         problem_frontend_id=problem.frontend_id,
@@ -134,6 +158,65 @@ def execute_leetcode_pipeline(payload: LeetCodePipelineInput) -> LeetCodePipelin
     )
 
 
+def _generate_assets_parallel(
+    session: AISession,
+    problem: LeetCodeProblemDetail,
+    payload: LeetCodePipelineInput,
+) -> tuple[GeneratedAssets, TestRunResult]:
+    """Gera testes (so pelo enunciado) e N candidatas em paralelo; fica com a primeira aprovada."""
+    candidates = max(1, payload.solution_candidates)
+    cancel_event = threading.Event()
+    session = replace(session, cancel_event=cancel_event)
+    executor = ThreadPoolExecutor(max_workers=candidates + 1, thread_name_prefix="leetcode-gen")
+    try:
+        # Cada tarefa leva uma copia do contexto para os spans entrarem na arvore do job.
+        tests_future = executor.submit(contextvars.copy_context().run, generate_tests_code, session, problem, None)
+        solution_futures = [
+            executor.submit(
+                contextvars.copy_context().run,
+                generate_solution_code,
+                session,
+                problem,
+                prompt_template=payload.solution_prompt_template,
+            )
+            for _ in range(candidates)
+        ]
+        tests_code = tests_future.result()
+
+        first_failed: tuple[str, TestRunResult] | None = None
+        first_error: Exception | None = None
+        for future in as_completed(solution_futures):
+            try:
+                solution_code = future.result()
+            except Exception as exc:
+                first_error = first_error or exc
+                continue
+
+            with span("run_solution_tests", candidate=True):
+                test_result = run_solution_tests(
+                    solution_code=solution_code,
+                    tests_code=tests_code,
+                    timeout_seconds=payload.test_timeout_seconds,
+                )
+            if test_result.success:
+                return GeneratedAssets(solution_code=solution_code, tests_code=tests_code), test_result
+            if first_failed is None:
+                first_failed = (solution_code, test_result)
+    finally:
+        # Candidatas em voo param de gastar tokens: as que nao comecaram sao descartadas e as em
+        # streaming fecham a conexao no proximo trecho. Sem esperar por elas: o uso que ainda chegar
+        # vai pelo `on_llm_call`, que precisa aceitar chamadas depois do retorno.
+        cancel_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if first_failed is None:
+        raise first_error or RuntimeError("Falha ao gerar solucao Python na IA.")
+
+    # Nenhuma candidata passou: a primeira segue para o ciclo de correcao.
+    solution_code, test_result = first_failed
+    return GeneratedAssets(solution_code=solution_code, tests_code=tests_code), test_result
+
+
 def _build_solution_filename(frontend_id: str, slug: str) -> str:
     safe_slug = re.sub(r"[^a-zA-Z0-9_-]+", "_", slug.strip()).strip("_")
     safe_id = re.sub(r"[^0-9]+", "", frontend_id.strip()) or "unknown"
@@ -66,6 +66,42 @@ Solution code:
 """.strip()
 
 
+PROMPT_GENERATE_TESTS_FROM_STATEMENT = """
+You are a software test engineer.
+
+Given a LeetCode problem statement, generate a Python test script for a solution
+that will be written separately. Return ONLY valid Python code, no markdown.
+
+Constraints:
+1) The script must import `Solution` from `solution` module.
+2) Call methods exactly as named in the starter code below.
+3) It must define `run_tests()` and execute it under `if __name__ == "__main__":`.
+4) Use official examples from the problem statement when possible.
+5) Add additional edge cases with deterministic expected outputs.
+6) If several answers are valid, assert on properties instead of one exact output.
+7) On failure, raise AssertionError with clear messages.
+8) Use only Python standard library (no pandas, numpy, pytest, or third-party libs).
+
+Problem metadata:
+- Frontend ID: {frontend_id}
+- Title: {title}
+- Difficulty: {difficulty}
+- Slug: {title_slug}
+
+Starter code (python3):
+{starter_code}
+
+Problem statement (HTML may be present):
+{content}
+
+Sample test case (raw):
+{sample_test_case}
+
+JSON metadata:
+{metadata_json}
+""".strip()
+
+
 PROMPT_FIX_SOLUTION = """
 You are debugging a failing LeetCode Python solution.
 
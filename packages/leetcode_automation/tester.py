@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import ast
 import subprocess
 import sys
 import tempfile
@@ -7,8 +8,20 @@ from pathlib import Path
 
 from .types import TestRunResult
 
+LOCAL_MODULES = {"solution", "tests"}
+
+
+def run_solution_tests(
+    solution_code: str,
+    tests_code: str,
+    timeout_seconds: int = 20,
+    precheck: bool = True,
+) -> TestRunResult:
+    if precheck:
+        precheck_result = precheck_solution_tests(solution_code, tests_code)
+        if precheck_result is not None:
+            return precheck_result
 
-def run_solution_tests(solution_code: str, tests_code: str, timeout_seconds: int = 20) -> TestRunResult:
     with tempfile.TemporaryDirectory(prefix="autofeedr-leetcode-test-") as tmp_dir:
         tmp_path = Path(tmp_dir)
         solution_path = tmp_path / "solution.py"
@@ -40,3 +53,54 @@ def run_solution_tests(solution_code: str, tests_code: str, timeout_seconds: int
             stderr=process.stderr,
             return_code=process.returncode,
         )
+
+
+def precheck_solution_tests(solution_code: str, tests_code: str) -> TestRunResult | None:
+    """Validacao estatica barata antes do subprocess; retorna falha ou None se ok."""
+    errors: list[str] = []
+    for filename, source in (("solution.py", solution_code), ("tests.py", tests_code)):
+        try:
+            tree = ast.parse(source, filename=filename)
+            compile(tree, filename, "exec")
+        except SyntaxError as exc:
+            errors.append(f'File "{filename}", line {exc.lineno}\nSyntaxError: {exc.msg}')
+            continue
+        except ValueError as exc:
+            errors.append(f'File "{filename}"\nValueError: {exc}')
+            continue
+
+        for module_name, lineno in _iter_imported_modules(tree):
+            if not _is_allowed_module(module_name):
+                errors.append(
+                    f'File "{filename}", line {lineno}\n'
+                    f"ModuleNotFoundError: modulo '{module_name}' fora da biblioteca padrao."
+                )
+
+    if not errors:
+        return None
+    return TestRunResult(
+        success=False,
+        stdout="",
+        stderr="Pre-check estatico falhou:\n" + "\n".join(errors),
+        return_code=1,
+    )
+
+
+def _iter_imported_modules(tree: ast.AST):
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield alias.name, node.lineno
+        elif isinstance(node, ast.ImportFrom):
+            # Imports relativos nao existem no diretorio temporario do teste.
+            if node.level:
+                yield "." * node.level + (node.module or ""), node.lineno
+            elif node.module:
+                yield node.module, node.lineno
+
+
+def _is_allowed_module(module_name: str) -> bool:
+    root = module_name.split(".", 1)[0]
+    if not root:
+        return False
+    return root in LOCAL_MODULES or root in sys.stdlib_module_names
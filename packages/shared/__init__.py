@@ -1,4 +1,23 @@
-from .ai_config import AIConfig, load_ai_config
+from .ai_config import AIConfig, load_ai_config, resolve_tenant
+from .llm_usage import LLMCallCallback, LLMCallCollector, LLMCallRecord
+from .llm_scheduler import LLM_SCHEDULER, TenantBudgetExceeded, TenantLLMScheduler, tenant_key
 from .runtime import ExecutionStateStore, configure_logging, log_event
+from .tracing import Tracer, span
 
-__all__ = ["ExecutionStateStore", "configure_logging", "log_event", "AIConfig", "load_ai_config"]
+__all__ = [
+    "ExecutionStateStore",
+    "configure_logging",
+    "log_event",
+    "AIConfig",
+    "load_ai_config",
+    "resolve_tenant",
+    "LLM_SCHEDULER",
+    "TenantBudgetExceeded",
+    "TenantLLMScheduler",
+    "tenant_key",
+    "LLMCallCallback",
+    "LLMCallCollector",
+    "LLMCallRecord",
+    "Tracer",
+    "span",
+]
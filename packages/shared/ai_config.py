@@ -3,6 +3,8 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 
+from .llm_scheduler import tenant_key
+
 
 @dataclass(frozen=True)
 class AIConfig:
@@ -11,6 +13,9 @@ class AIConfig:
     gemini_api_key: str | None
     openai_api_key: str | None
     openai_base_url: str
+    stream: bool = False
+    timeout_seconds: float = 60.0
+    max_output_tokens: int | None = None
 
 
 def load_ai_config() -> AIConfig:
@@ -28,9 +33,36 @@ def load_ai_config() -> AIConfig:
         gemini_api_key=(os.getenv("GEMINI_API_KEY") or "").strip() or None,
         openai_api_key=(os.getenv("OPENAI_API_KEY") or "").strip() or None,
         openai_base_url=(os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1").strip().rstrip("/"),
+        stream=(os.getenv("LLM_STREAM") or "false").strip().lower() in {"1", "true", "yes"},
+        timeout_seconds=_env_float("LLM_TIMEOUT_SECONDS", 60.0),
+        max_output_tokens=_env_int("LLM_MAX_OUTPUT_TOKENS"),
     )
 
 
+def resolve_tenant(openai_api_key: str | None = None, config: AIConfig | None = None) -> str | None:
+    """Tenant que de fato gasta tokens no provedor configurado; use o mesmo valor na checagem e no registro."""
+    config = config or load_ai_config()
+    if config.provider == "gemini":
+        return tenant_key(config.gemini_api_key)
+    return tenant_key(openai_api_key)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        value = float((os.getenv(name) or "").strip())
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _env_int(name: str) -> int | None:
+    try:
+        value = int((os.getenv(name) or "").strip())
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
 def _normalize_gemini_model(model_name: str) -> str:
     if model_name.startswith("models/"):
         return model_name.split("/", 1)[1]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Iterator
+
+TOKEN_WINDOW_SECONDS = 60.0
+
+
+class TenantBudgetExceeded(RuntimeError):
+    """Tenant estourou o orcamento de tokens/minuto; o job deve ser adiado ate `retry_at`."""
+
+    def __init__(self, tenant: str, retry_at: datetime):
+        super().__init__(
+            "Orcamento de tokens por minuto excedido. "
+            f"Nova tentativa em {retry_at.isoformat(timespec='seconds')}."
+        )
+        self.tenant = tenant
+        self.retry_at = retry_at
+
+
+class TenantLLMScheduler:
+    """Limita chamadas de IA concorrentes e tokens por minuto por tenant (chave de API).
+
+    Estado em memoria do processo: com varias replicas de worker cada uma aplica os limites isoladamente.
+    """
+
+    def __init__(self, max_concurrent: int = 2, tokens_per_minute: int = 0):
+        self.max_concurrent = max(1, max_concurrent)
+        self.tokens_per_minute = max(0, tokens_per_minute)
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._usage: dict[str, deque[tuple[float, int]]] = {}
+
+    def configure(self, max_concurrent: int, tokens_per_minute: int) -> None:
+        with self._lock:
+            self.max_concurrent = max(1, max_concurrent)
+            self.tokens_per_minute = max(0, tokens_per_minute)
+            self._semaphores.clear()
+
+    @contextmanager
+    def slot(self, tenant: str | None) -> Iterator[None]:
+        if not tenant:
+            yield
+            return
+        semaphore = self._semaphore(tenant)
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def record_tokens(self, tenant: str | None, tokens: int) -> None:
+        if not tenant or tokens <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            window = self._usage.setdefault(tenant, deque())
+            window.append((now, tokens))
+            self._prune(window, now)
+
+    def tokens_last_minute(self, tenant: str) -> int:
+        now = time.monotonic()
+        with self._lock:
+            window = self._usage.get(tenant)
+            if not window:
+                return 0
+            self._prune(window, now)
+            return sum(tokens for _, tokens in window)
+
+    def retry_at(self, tenant: str | None) -> datetime | None:
+        """Retorna quando o tenant volta a ter orcamento, ou None se ja pode rodar."""
+        if not tenant or not self.tokens_per_minute:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            window = self._usage.get(tenant)
+            if not window:
+                return None
+            self._prune(window, now)
+            used = sum(tokens for _, tokens in window)
+            if used < self.tokens_per_minute:
+                return None
+            # Espera ate que entradas antigas saiam da janela e liberem orcamento.
+            wait_seconds = TOKEN_WINDOW_SECONDS
+            for started_at, tokens in window:
+                used -= tokens
+                if used < self.tokens_per_minute:
+                    wait_seconds = started_at + TOKEN_WINDOW_SECONDS - now
+                    break
+        return datetime.now(UTC) + timedelta(seconds=max(1.0, wait_seconds))
+
+    def ensure_budget(self, tenant: str | None) -> None:
+        retry_at = self.retry_at(tenant)
+        if retry_at is not None:
+            raise TenantBudgetExceeded(tenant or "", retry_at)
+
+    def _semaphore(self, tenant: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(tenant)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_concurrent)
+                self._semaphores[tenant] = semaphore
+            return semaphore
+
+    def _prune(self, window: deque[tuple[float, int]], now: float) -> None:
+        while window and window[0][0] <= now - TOKEN_WINDOW_SECONDS:
+            window.popleft()
+
+
+def tenant_key(api_key: str | None) -> str | None:
+    """Identificador estavel do tenant sem manter a chave de API em memoria compartilhada."""
+    cleaned = (api_key or "").strip()
+    if not cleaned:
+        return None
+    return hashlib.sha256(cleaned.encode("utf-8")).hexdigest()[:16]
+
+
+LLM_SCHEDULER = TenantLLMScheduler()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class LLMCallRecord:
+    """Uso e latencia de uma chamada de IA, entregue ao callback da sessao."""
+
+    stage: str
+    provider: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    latency_ms: int
+    success: bool
+    error: str | None = None
+
+
+LLMCallCallback = Callable[[LLMCallRecord], None]
+
+
+class LLMCallCollector:
+    """Coleta os registros de um job vindos de varias threads.
+
+    Depois de `drain`, chamadas que ainda terminam em segundo plano (candidatas canceladas)
+    vao direto para `on_late`, em vez de se perderem.
+    """
+
+    def __init__(self, on_late: Callable[[list[LLMCallRecord]], None]):
+        self._on_late = on_late
+        self._calls: list[LLMCallRecord] = []
+        self._drained = False
+        self._lock = threading.Lock()
+
+    def append(self, call: LLMCallRecord) -> None:
+        with self._lock:
+            if not self._drained:
+                self._calls.append(call)
+                return
+        self._on_late([call])
+
+    def drain(self) -> list[LLMCallRecord]:
+        with self._lock:
+            calls, self._calls = self._calls, []
+            self._drained = True
+        return calls
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import Counter, Gauge, Histogram
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "autofeedr_http_request_duration_seconds",
+    "Latencia das requisicoes HTTP da API por rota.",
+    ["method", "route", "status"],
+)
+QUEUE_DEPTH = Gauge(
+    "autofeedr_queue_depth",
+    "Jobs na fila por status.",
+    ["queue", "status"],
+)
+JOB_CLAIM_DELAY_SECONDS = Histogram(
+    "autofeedr_job_claim_delay_seconds",
+    "Atraso entre scheduled_for e o inicio da execucao do job.",
+    ["queue"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+JOB_DURATION_SECONDS = Histogram(
+    "autofeedr_job_duration_seconds",
+    "Duracao de execucao de jobs por resultado.",
+    ["queue", "outcome"],
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200),
+)
+JOB_RETRIES_TOTAL = Counter(
+    "autofeedr_job_retries_total",
+    "Jobs reagendados para nova tentativa.",
+    ["queue"],
+)
+EXTERNAL_CALL_SECONDS = Histogram(
+    "autofeedr_external_call_duration_seconds",
+    "Latencia de chamadas externas (IA, GitHub, LinkedIn, arXiv).",
+    ["service", "operation", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120),
+)
+
+
+@contextmanager
+def observe_external_call(service: str, operation: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        EXTERNAL_CALL_SECONDS.labels(service=service, operation=operation, outcome=outcome).observe(
+            time.perf_counter() - started
+        )
@@ -1,17 +1,33 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import os
+import queue
+import random
 from datetime import UTC, datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+
+def _dumps(payload: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
 
 class JsonFormatter(logging.Formatter):
     """Formatter simples para logs estruturados em JSON."""
 
     def format(self, record: logging.LogRecord) -> str:
         payload = {
-            "ts": datetime.now(UTC).isoformat(timespec="seconds"),
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="seconds"),
             "level": record.levelname,
             "logger": record.name,
             "msg": record.getMessage(),
@@ -21,19 +37,88 @@ class JsonFormatter(logging.Formatter):
             payload.update(fields)
         if record.exc_info:
             payload["exc"] = self.formatException(record.exc_info)
-        return json.dumps(payload, ensure_ascii=False)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return _dumps(payload)
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Mantem so uma fracao dos registros abaixo de INFO."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = min(max(rate, 0.0), 1.0)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.INFO or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enfileira o registro cru; a serializacao JSON fica na thread do listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: QueueListener | None = None
+
+
+def _stop_listener() -> None:
+    """Esvazia a fila e para o listener atual; registrado uma unica vez no `atexit`."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
 
 
 def configure_logging(logger_name: str = "autofeedr", level: int = logging.INFO) -> logging.Logger:
-    """Configura logging raiz em JSON e retorna logger de aplicacao."""
-    handler = logging.StreamHandler()
-    handler.setFormatter(JsonFormatter())
+    """Configura logging raiz em JSON e retorna logger de aplicacao.
+
+    Por padrao a escrita em stdout roda numa thread propria (`LOG_ASYNC=false` volta ao modo sincrono),
+    `LOG_LEVEL` sobrescreve `level` e registros DEBUG sao amostrados por `LOG_DEBUG_SAMPLE_RATE`.
+    """
+    global _listener
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter())
+    sample_rate = _env_rate("LOG_DEBUG_SAMPLE_RATE", 1.0)
+
+    _stop_listener()
+
+    if (os.getenv("LOG_ASYNC") or "true").strip().lower() in {"1", "true", "yes"}:
+        handler: logging.Handler = _DeferredQueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(handler.queue, stream_handler, respect_handler_level=False)
+        _listener.start()
+    else:
+        handler = stream_handler
+    handler.addFilter(DebugSamplingFilter(sample_rate))
+
+    env_level = logging.getLevelName((os.getenv("LOG_LEVEL") or "").strip().upper())
     root = logging.getLogger()
     root.handlers = [handler]
-    root.setLevel(level)
+    root.setLevel(env_level if isinstance(env_level, int) else level)
     return logging.getLogger(logger_name)
 
 
+def _env_rate(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
 def log_event(logger: logging.Logger, level: int, message: str, **fields) -> None:
     """Padroniza envio de eventos com campo `fields` serializado."""
     logger.log(level, message, extra={"fields": fields})
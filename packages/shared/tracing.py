@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+PROFILE_TOP_FUNCTIONS = 30
+
+_current_tracer: contextvars.ContextVar[Tracer | None] = contextvars.ContextVar("autofeedr_tracer", default=None)
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("autofeedr_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    attributes: dict[str, Any] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.monotonic)
+    duration_ms: float | None = None
+    error: str | None = None
+    children: list[Span] = field(default_factory=list)
+
+    def to_dict(self, origin: float) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "name": self.name,
+            "offset_ms": round((self.started_at - origin) * 1000, 1),
+            "duration_ms": self.duration_ms,
+        }
+        if self.attributes:
+            payload["attributes"] = self.attributes
+        if self.error:
+            payload["error"] = self.error
+        if self.children:
+            payload["children"] = [child.to_dict(origin) for child in self.children]
+        return payload
+
+
+class Tracer:
+    """Arvore de spans de um job, com captura opcional de cProfile."""
+
+    def __init__(self, name: str, profile: bool = False, **attributes: Any):
+        self.root = Span(name=name, attributes=dict(attributes))
+        self.profile = profile
+        self.profile_text: str | None = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self) -> Iterator[Tracer]:
+        tracer_token = _current_tracer.set(self)
+        span_token = _current_span.set(self.root)
+        profiler = cProfile.Profile() if self.profile else None
+        self.root.started_at = time.monotonic()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield self
+        except Exception as exc:
+            self.root.error = str(exc)[:500]
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.profile_text = _format_profile(profiler)
+            self.root.duration_ms = round((time.monotonic() - self.root.started_at) * 1000, 1)
+            _current_span.reset(span_token)
+            _current_tracer.reset(tracer_token)
+
+    def attach(self, parent: Span, child: Span) -> None:
+        # Spans podem ser fechados em threads diferentes (geracao paralela).
+        with self._lock:
+            parent.children.append(child)
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = self.root.to_dict(self.root.started_at)
+        if self.profile_text:
+            payload["profile"] = self.profile_text
+        return payload
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Abre um span filho do span atual; sem tracer ativo nao faz nada."""
+    tracer = _current_tracer.get()
+    parent = _current_span.get()
+    if tracer is None or parent is None:
+        yield None
+        return
+
+    current = Span(name=name, attributes=attributes)
+    tracer.attach(parent, current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as exc:
+        current.error = str(exc)[:500]
+        raise
+    finally:
+        current.duration_ms = round((time.monotonic() - current.started_at) * 1000, 1)
+        _current_span.reset(token)
+
+
+def _format_profile(profiler: cProfile.Profile) -> str:
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_FUNCTIONS)
+    return buffer.getvalue()
@@ -0,0 +1,66 @@
+"""
+Micro-benchmark de uma passagem completa de `gerar_post` com logging desligado (WARNING) e ligado (DEBUG).
+
+A chamada HTTP ao provedor e substituida por uma resposta fixa; todo o resto (sessao, spans,
+agendador por tenant, metricas e logs) roda como no worker. Os logs ligados sao escritos em
+JSON no /dev/null pelo mesmo `configure_logging` da API e do worker.
+
+Uso, na raiz do repositorio:
+    python scripts/bench_gerar_post_logging.py [iteracoes]
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from packages.Escritor import gerar_post  # noqa: E402
+from packages.Escritor.src import utils  # noqa: E402
+from packages.shared import configure_logging  # noqa: E402
+
+RESPOSTA = "Resumo do paper em poucas linhas. " * 20
+INFORMACOES = "Title: Paper\nAuthors: A, B\nSummary: " + "Texto do resumo. " * 40
+TRADUCAO = "Translate to English:\n{post_portugues}"
+
+
+def _resposta_fixa(modelo, prompt, uso):
+    uso["prompt_tokens"] = len(prompt) // 4
+    uso["completion_tokens"] = len(RESPOSTA) // 4
+    return RESPOSTA
+
+
+def _medir(level: str, iteracoes: int) -> float:
+    os.environ["LOG_LEVEL"] = level
+    os.environ["LOG_ASYNC"] = "false"
+    configure_logging("autofeedr.bench")
+    devnull = open(os.devnull, "w", encoding="utf-8")
+    logging.getLogger().handlers[0].setStream(devnull)
+
+    for _ in range(50):
+        gerar_post(INFORMACOES, prompt_translation=TRADUCAO, openai_api_key="sk-bench")
+    inicio = time.perf_counter()
+    for _ in range(iteracoes):
+        gerar_post(INFORMACOES, prompt_translation=TRADUCAO, openai_api_key="sk-bench")
+    decorrido = time.perf_counter() - inicio
+    devnull.close()
+    return decorrido / iteracoes * 1_000_000
+
+
+def main() -> None:
+    iteracoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    os.environ.setdefault("LLM_PROVIDER", "openai")
+    utils._gerar_resposta_openai = _resposta_fixa
+
+    desligado = _medir("WARNING", iteracoes)
+    ligado = _medir("DEBUG", iteracoes)
+    print(f"gerar_post, {iteracoes} iteracoes")
+    print(f"  logging WARNING: {desligado:8.1f} us/chamada")
+    print(f"  logging DEBUG:   {ligado:8.1f} us/chamada ({ligado - desligado:+.1f} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Servidor local que imita `POST /v2/ugcPosts` do LinkedIn para testar a publicacao sem a API real.
+
+Cada argumento e a resposta de um POST, na ordem; a ultima se repete. Formato `status[:retry_after]`,
+e `422dup` devolve 422 com corpo de conteudo duplicado.
+
+Uso:
+    python scripts/linkedin_stub_server.py 8089 429:5 503 201
+    LINKEDIN_API_BASE_URL=http://127.0.0.1:8089 python -m worker.app.runner
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Responses:
+    def __init__(self, specs: list[str]):
+        self.specs = specs or ["201"]
+        self.index = 0
+        self.lock = threading.Lock()
+
+    def next(self) -> str:
+        with self.lock:
+            spec = self.specs[min(self.index, len(self.specs) - 1)]
+            self.index += 1
+            return spec
+
+
+def make_handler(responses: _Responses) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802 - nome exigido pelo http.server
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            spec = responses.next()
+            headers: dict[str, str] = {}
+            if spec == "422dup":
+                status, body = 422, {"message": "Content is a duplicate of urn:li:share:1", "code": "DUPLICATE_POST"}
+            else:
+                raw_status, _, retry_after = spec.partition(":")
+                status = int(raw_status)
+                body = {"id": "urn:li:share:stub"} if status < 300 else {"message": f"stub {status}"}
+                if retry_after:
+                    headers["Retry-After"] = retry_after
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args) -> None:
+            sys.stderr.write(f"stub-linkedin {self.command} {self.path} -> {args[1] if len(args) > 1 else ''}\n")
+
+    return Handler
+
+
+def serve(port: int, specs: list[str]) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(_Responses(specs)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8089
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(_Responses(sys.argv[2:])))
+    server.serve_forever()
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+# Mesmo layout dos containers: `packages`/`worker` a partir da raiz e `app` a partir de `backend/`.
+for path in (ROOT, ROOT / "backend"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
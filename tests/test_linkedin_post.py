@@ -0,0 +1,112 @@
+"""
+Classificacao das falhas de `postar_no_linkedin` contra o stub local de `scripts/linkedin_stub_server.py`.
+
+Rode da raiz do repositorio: `python -m pytest tests`.
+"""
+from __future__ import annotations
+
+import socket
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from packages.Linkedin.src import postLinkedin
+from packages.Linkedin.src.postLinkedin import LinkedInPostError, LinkedInRateLimited, postar_no_linkedin
+from scripts.linkedin_stub_server import serve
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def linkedin_stub(monkeypatch):
+    servers = []
+
+    def start(*specs: str) -> None:
+        port = _free_port()
+        servers.append(serve(port, list(specs)))
+        monkeypatch.setenv("LINKEDIN_API_BASE_URL", f"http://127.0.0.1:{port}")
+
+    # Sessao nova por teste: o pool compartilhado nao deve carregar conexoes de outro stub.
+    monkeypatch.setattr(postLinkedin, "_session", None)
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _post() -> bool:
+    return postar_no_linkedin("token", "urn:li:person:stub", "Post de teste")
+
+
+def test_created_returns_true(linkedin_stub):
+    linkedin_stub("201")
+    assert _post() is True
+
+
+def test_429_is_rate_limited_until_retry_after(linkedin_stub):
+    linkedin_stub("429:120")
+    before = datetime.now(UTC)
+    with pytest.raises(LinkedInRateLimited) as info:
+        _post()
+    assert info.value.status_code == 429
+    assert not info.value.permanent
+    assert before + timedelta(seconds=110) <= info.value.retry_at <= before + timedelta(seconds=130)
+
+
+def test_429_without_retry_after_uses_default_delay(linkedin_stub):
+    linkedin_stub("429")
+    before = datetime.now(UTC)
+    with pytest.raises(LinkedInRateLimited) as info:
+        _post()
+    assert info.value.retry_at >= before + timedelta(seconds=postLinkedin.DEFAULT_RETRY_AFTER_SECONDS - 5)
+
+
+@pytest.mark.parametrize("status", ["500", "502", "503"])
+def test_5xx_is_transient(linkedin_stub, status):
+    linkedin_stub(status)
+    with pytest.raises(LinkedInPostError) as info:
+        _post()
+    assert not isinstance(info.value, LinkedInRateLimited)
+    assert info.value.status_code == int(status)
+    assert not info.value.permanent
+    assert info.value.retry_at is None
+
+
+def test_5xx_keeps_retry_after(linkedin_stub):
+    linkedin_stub("503:60")
+    with pytest.raises(LinkedInPostError) as info:
+        _post()
+    assert not info.value.permanent
+    assert info.value.retry_at is not None
+
+
+def test_401_is_permanent_expired_token(linkedin_stub):
+    linkedin_stub("401")
+    with pytest.raises(LinkedInPostError) as info:
+        _post()
+    assert info.value.status_code == 401
+    assert info.value.permanent
+    assert "token expirado" in str(info.value)
+
+
+def test_422_duplicate_is_permanent(linkedin_stub):
+    linkedin_stub("422dup")
+    with pytest.raises(LinkedInPostError) as info:
+        _post()
+    assert info.value.status_code == 422
+    assert info.value.permanent
+    assert "conteudo duplicado" in str(info.value)
+
+
+def test_network_failure_is_transient(monkeypatch):
+    monkeypatch.setenv("LINKEDIN_API_BASE_URL", f"http://127.0.0.1:{_free_port()}")
+    monkeypatch.setenv("LINKEDIN_CONNECT_TIMEOUT_SECONDS", "1")
+    monkeypatch.setattr(postLinkedin, "_session", None)
+    with pytest.raises(LinkedInPostError) as info:
+        _post()
+    assert info.value.status_code is None
+    assert not info.value.permanent
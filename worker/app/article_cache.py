@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.db.session import SessionLocal
+from app.models.models import ArxivArticleRecord, ArxivTopicResult, UsedArticle
+from packages.arxiv_reciver.src.article_receiver import fetch_article_by_id, resolve_date_window, search_articles
+from packages.arxiv_reciver.src.schema import ArxivArticle
+from packages.shared import log_event
+from packages.shared.metrics import observe_external_call
+
+
+logger = logging.getLogger("autofeedr.worker.article_cache")
+ARXIV_URL_PATTERN = re.compile(r"arxiv\.org/(abs|pdf)/([0-9]{4}\.[0-9]{4,5})(v[0-9]+)?")
+
+
+class NoUnusedArticle(RuntimeError):
+    """A conta ja publicou todos os artigos da janela; repetir o job nao traz nada novo."""
+
+
+def extract_arxiv_id(url: str) -> str | None:
+    match = ARXIV_URL_PATTERN.search(url)
+    if not match:
+        return None
+    return match.group(2)
+
+
+def article_key(article: ArxivArticle) -> str:
+    return extract_arxiv_id(article.url) or article.url
+
+
+def content_hash(article: ArxivArticle) -> str:
+    """Hash do titulo e resumo normalizados; pega o mesmo paper publicado com outro id ou versao."""
+    normalized = " ".join(f"{article.title}\n{article.summary}".lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _naive_utc(value: datetime) -> datetime:
+    return value.astimezone(UTC).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _from_record(record: ArxivArticleRecord) -> ArxivArticle:
+    return ArxivArticle(
+        title=record.title,
+        summary=record.summary,
+        authors=json.loads(record.authors_json or "[]"),
+        published=record.published.replace(tzinfo=UTC),
+        updated=record.updated.replace(tzinfo=UTC),
+        url=record.url,
+    )
+
+
+def _store_articles(db: Session, articles: list[ArxivArticle]) -> list[str]:
+    keys = [article_key(article) for article in articles]
+    existing = {
+        arxiv_id
+        for (arxiv_id,) in db.query(ArxivArticleRecord.arxiv_id).filter(ArxivArticleRecord.arxiv_id.in_(keys)).all()
+    }
+    for key, article in zip(keys, articles):
+        if key in existing:
+            continue
+        existing.add(key)
+        db.add(
+            ArxivArticleRecord(
+                arxiv_id=key,
+                title=article.title,
+                summary=article.summary,
+                authors_json=json.dumps(list(article.authors), ensure_ascii=False),
+                url=article.url,
+                published=_naive_utc(article.published),
+                updated=_naive_utc(article.updated),
+            )
+        )
+    return keys
+
+
+def _load_articles(db: Session, keys: list[str]) -> list[ArxivArticle] | None:
+    if not keys:
+        return []
+    records = {
+        record.arxiv_id: record
+        for record in db.query(ArxivArticleRecord).filter(ArxivArticleRecord.arxiv_id.in_(keys)).all()
+    }
+    if len(records) < len(set(keys)):
+        return None
+    return [_from_record(records[key]) for key in keys]
+
+
+def _write(callback: Callable[[Session], None]) -> None:
+    """Grava no cache numa sessao propria; falhas nao afetam o job que fez a busca."""
+    with SessionLocal() as db:
+        try:
+            callback(db)
+            db.commit()
+        except IntegrityError:
+            # Outro processo gravou a mesma chave antes; o conteudo equivalente ja esta no cache.
+            db.rollback()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            log_event(logger, logging.WARNING, "arxiv_cache_write_failed", error=str(exc))
+
+
+def get_article_by_id(arxiv_id: str) -> ArxivArticle | None:
+    with SessionLocal() as db:
+        record = db.query(ArxivArticleRecord).filter(ArxivArticleRecord.arxiv_id == arxiv_id).first()
+        if record:
+            return _from_record(record)
+
+    with observe_external_call("arxiv", "get_by_id"):
+        article = fetch_article_by_id(arxiv_id)
+    if article:
+        _write(lambda db: _store_articles(db, [article]))
+    return article
+
+
+def get_topic_articles(
+    topic: str,
+    max_results: int,
+    start_date: datetime | str | None = None,
+    end_date: datetime | str | None = None,
+    reference: datetime | None = None,
+) -> list[ArxivArticle]:
+    """Artigos mais recentes do tema na janela, consultando o indice (tema, janela) antes do arXiv."""
+    window_start, window_end = resolve_date_window(start_date, end_date, reference)
+    topic_key = topic.strip().lower()
+    start_key, end_key = _naive_utc(window_start), _naive_utc(window_end)
+
+    with SessionLocal() as db:
+        cached = (
+            db.query(ArxivTopicResult)
+            .filter(
+                ArxivTopicResult.topic_key == topic_key,
+                ArxivTopicResult.window_start == start_key,
+                ArxivTopicResult.window_end == end_key,
+            )
+            .first()
+        )
+        if cached and cached.expires_at > datetime.utcnow() and cached.max_results >= max_results:
+            articles = _load_articles(db, json.loads(cached.article_ids_json)[:max_results])
+            if articles is not None:
+                return articles
+
+    with observe_external_call("arxiv", "search"):
+        articles = search_articles(topic, window_start, window_end, max_results)
+
+    def _save(db: Session) -> None:
+        keys = _store_articles(db, articles)
+        row = (
+            db.query(ArxivTopicResult)
+            .filter(
+                ArxivTopicResult.topic_key == topic_key,
+                ArxivTopicResult.window_start == start_key,
+                ArxivTopicResult.window_end == end_key,
+            )
+            .first()
+        )
+        if row is None:
+            row = ArxivTopicResult(topic_key=topic_key, window_start=start_key, window_end=end_key)
+            db.add(row)
+        now = datetime.utcnow()
+        row.max_results = max_results
+        row.article_ids_json = json.dumps(keys)
+        row.fetched_at = now
+        row.expires_at = now + timedelta(minutes=settings.arxiv_cache_ttl_minutes)
+
+    _write(_save)
+    return articles
+
+
+def select_unused_article(db: Session, account_id: int, articles: list[ArxivArticle]) -> ArxivArticle | None:
+    """Artigo mais recente ainda nao usado pela conta, comparando por id do arXiv e por hash do conteudo."""
+    if not articles:
+        return None
+    keys = {article_key(article) for article in articles}
+    hashes = {content_hash(article) for article in articles}
+    used_keys: set[str] = set()
+    used_hashes: set[str] = set()
+    for used_key, used_hash in (
+        db.query(UsedArticle.arxiv_id, UsedArticle.content_hash)
+        .filter(
+            UsedArticle.account_id == account_id,
+            or_(UsedArticle.arxiv_id.in_(keys), UsedArticle.content_hash.in_(hashes)),
+        )
+        .all()
+    ):
+        used_keys.add(used_key)
+        used_hashes.add(used_hash)
+
+    for article in sorted(articles, key=lambda item: item.published, reverse=True):
+        if article_key(article) not in used_keys and content_hash(article) not in used_hashes:
+            return article
+    return None
+
+
+def mark_article_used(
+    db: Session,
+    account_id: int,
+    key: str,
+    article_hash: str | None,
+    job_id: int | None = None,
+) -> None:
+    """Registra `article_key`/`content_hash` como usados pela conta na transacao do job, tolerando corrida."""
+    exists = (
+        db.query(UsedArticle.id)
+        .filter(UsedArticle.account_id == account_id, UsedArticle.arxiv_id == key)
+        .first()
+    )
+    if exists:
+        return
+    try:
+        with db.begin_nested():
+            db.add(UsedArticle(account_id=account_id, arxiv_id=key, content_hash=article_hash, job_id=job_id))
+    except IntegrityError:
+        pass
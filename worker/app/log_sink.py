@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from packages.shared import log_event
+
+
+logger = logging.getLogger("autofeedr.worker.log_sink")
+
+
+class JobLogSink:
+    """Buffer de logs de job gravado em lote numa conexao propria.
+
+    Os logs nao dependem da transacao do job: sobrevivem a `db.rollback()` e
+    ficam visiveis para a API antes do commit do ciclo.
+    """
+
+    def __init__(self, engine: Engine, batch_size: int = 200, flush_seconds: float = 2.0, max_buffered: int = 5000):
+        self.engine = engine
+        self.batch_size = max(batch_size, 1)
+        self.flush_seconds = flush_seconds
+        self.max_buffered = max(max_buffered, self.batch_size)
+        self._rows: list[tuple[type, dict]] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, model: type, job_id: int, level: str, message: str) -> None:
+        row = {"job_id": job_id, "level": level, "message": message, "created_at": datetime.utcnow()}
+        with self._lock:
+            self._rows.append((model, row))
+            due = len(self._rows) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_seconds
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            rows, self._rows = self._rows, []
+            self._last_flush = time.monotonic()
+        if not rows:
+            return 0
+
+        try:
+            self._insert(rows)
+        except OperationalError as exc:
+            # Banco fora do ar ou conexao caida: devolve tudo para a proxima tentativa.
+            self._requeue(rows)
+            log_event(logger, logging.ERROR, "job_log_flush_failed", rows=len(rows), error=str(exc))
+            return 0
+        except Exception as exc:
+            log_event(logger, logging.WARNING, "job_log_batch_rejected", rows=len(rows), error=str(exc))
+            return self._insert_one_by_one(rows)
+        return len(rows)
+
+    def _insert(self, rows: list[tuple[type, dict]]) -> None:
+        by_model: dict[type, list[dict]] = {}
+        for model, row in rows:
+            by_model.setdefault(model, []).append(row)
+        with self.engine.begin() as conn:
+            for model, model_rows in by_model.items():
+                conn.execute(insert(model), model_rows)
+
+    def _insert_one_by_one(self, rows: list[tuple[type, dict]]) -> int:
+        """Isola a linha invalida (ex.: FK de job apagado) para ela nao travar os logs seguintes."""
+        written = 0
+        for index, (model, row) in enumerate(rows):
+            try:
+                self._insert([(model, row)])
+            except OperationalError as exc:
+                self._requeue(rows[index:])
+                log_event(logger, logging.ERROR, "job_log_flush_failed", rows=len(rows) - index, error=str(exc))
+                break
+            except Exception as exc:
+                log_event(
+                    logger,
+                    logging.ERROR,
+                    "job_log_row_dropped",
+                    job_id=row["job_id"],
+                    table=model.__tablename__,
+                    error=str(exc),
+                )
+            else:
+                written += 1
+        return written
+
+    def _requeue(self, rows: list[tuple[type, dict]]) -> None:
+        with self._lock:
+            # Volta ao inicio do buffer, descartando os mais antigos se passar do limite.
+            self._rows = (rows + self._rows)[-self.max_buffered :]
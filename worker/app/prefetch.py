@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import UTC, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from croniter import croniter
+from sqlalchemy import or_
+
+from app.core.settings import settings
+from app.db.session import SessionLocal
+from app.models.models import Schedule
+from packages.arxiv_reciver.src.article_receiver import resolve_date_window
+from packages.shared import log_event
+from worker.app.article_cache import get_topic_articles
+
+
+logger = logging.getLogger("autofeedr.worker.prefetch")
+
+
+def upcoming_arxiv_topics(now_utc: datetime, horizon: timedelta) -> list[tuple[datetime, str]]:
+    """Um disparo por (tema, janela do arXiv) ate `now_utc + horizon`, do mais proximo ao mais distante."""
+    with SessionLocal() as db:
+        schedules = (
+            db.query(Schedule)
+            .filter(
+                Schedule.is_active.is_(True),
+                or_(Schedule.source_mode == "arxiv", Schedule.source_mode.is_(None)),
+            )
+            .all()
+        )
+        candidates = [(schedule.cron_expr, schedule.timezone, schedule.topic) for schedule in schedules]
+
+    limit = now_utc + horizon
+    earliest: dict[tuple[str, tuple[datetime, datetime]], tuple[datetime, str]] = {}
+    for cron_expr, timezone, topic in candidates:
+        try:
+            local_now = now_utc.astimezone(ZoneInfo(timezone))
+            fire_at = croniter(cron_expr, local_now).get_next(datetime).astimezone(UTC)
+        except Exception as exc:
+            log_event(logger, logging.WARNING, "arxiv_prefetch_schedule_skipped", cron=cron_expr, error=str(exc))
+            continue
+        if fire_at > limit:
+            continue
+        # O job ancora a janela no `scheduled_for` (= disparo); temas iguais em dias diferentes aquecem as duas.
+        key = (topic.strip().lower(), resolve_date_window(reference=fire_at))
+        if key not in earliest or fire_at < earliest[key][0]:
+            earliest[key] = (fire_at, topic)
+    return sorted(earliest.values())
+
+
+def prefetch_upcoming_topics(now_utc: datetime | None = None) -> int:
+    """Aquece o cache de artigos para os disparos da proxima janela; retorna os temas processados."""
+    now_utc = now_utc or datetime.now(UTC)
+    upcoming = upcoming_arxiv_topics(now_utc, timedelta(minutes=settings.arxiv_prefetch_horizon_minutes))
+    warmed = 0
+    for fire_at, topic in upcoming:
+        try:
+            # Mesma janela e quantidade que o job usara no disparo, para ele encontrar tudo no cache.
+            get_topic_articles(topic, max_results=settings.arxiv_candidate_window, reference=fire_at)
+            warmed += 1
+        except Exception as exc:
+            log_event(logger, logging.WARNING, "arxiv_prefetch_failed", topic=topic, error=str(exc))
+    if upcoming:
+        log_event(logger, logging.INFO, "arxiv_prefetch_done", topics=len(upcoming), warmed=warmed)
+    return warmed
+
+
+def _prefetch_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        try:
+            prefetch_upcoming_topics()
+        except Exception as exc:
+            log_event(logger, logging.ERROR, "arxiv_prefetch_cycle_failed", error=str(exc))
+        stop.wait(max(settings.arxiv_prefetch_interval_minutes, 1) * 60)
+
+
+def start_prefetch_thread() -> threading.Event | None:
+    """Roda o prefetch numa thread daemon para nao atrasar o loop de jobs; `None` se desativado."""
+    if settings.arxiv_prefetch_horizon_minutes <= 0:
+        return None
+    stop = threading.Event()
+    threading.Thread(target=_prefetch_loop, args=(stop,), name="arxiv-prefetch", daemon=True).start()
+    return stop
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import math
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.models.models import JobLog, LeetCodeJobLog, LeetCodeScheduleRun, ScheduleRun
+from packages.shared import log_event
+
+
+logger = logging.getLogger("autofeedr.worker.retention")
+RETENTION_MODELS = (JobLog, LeetCodeJobLog, ScheduleRun, LeetCodeScheduleRun)
+
+
+def _archive_rows(model, rows: list, archive_dir: Path) -> None:
+    """Anexa as linhas em JSONL gzip, um arquivo por tabela e dia da execucao."""
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    day = datetime.now(UTC).strftime("%Y%m%d")
+    path = archive_dir / f"{model.__tablename__}-{day}.jsonl.gz"
+    columns = [attr.key for attr in inspect(model).column_attrs]
+    with gzip.open(path, "at", encoding="utf-8") as handle:
+        for row in rows:
+            payload = {column: getattr(row, column) for column in columns}
+            handle.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+
+
+def purge_table(
+    db: Session,
+    model,
+    cutoff: datetime,
+    batch_size: int,
+    archive_dir: Path | None,
+    max_batches: int,
+) -> tuple[int, bool]:
+    """Remove ate `max_batches` lotes com `created_at < cutoff`, um commit por lote; indica se ainda sobrou."""
+    removed = 0
+    for _ in range(max_batches):
+        ids = [
+            row_id
+            for (row_id,) in db.query(model.id)
+            .filter(model.created_at < cutoff)
+            .order_by(model.id.asc())
+            .limit(batch_size)
+            .all()
+        ]
+        if not ids:
+            return removed, False
+        if archive_dir is not None:
+            _archive_rows(model, db.query(model).filter(model.id.in_(ids)).order_by(model.id.asc()).all(), archive_dir)
+        db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        removed += len(ids)
+        if len(ids) < batch_size:
+            return removed, False
+    return removed, True
+
+
+def run_retention(db: Session) -> tuple[dict[str, int], bool]:
+    """Uma rodada limitada a `retention_max_batches` lotes no total; `True` se ainda ha linhas antigas."""
+    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=settings.retention_days)
+    archive_dir = Path(settings.retention_archive_dir) if settings.retention_archive_dir else None
+    batch_size = max(settings.retention_batch_size, 1)
+    batches_left = max(settings.retention_max_batches, 1)
+    removed: dict[str, int] = {}
+    pending = False
+    for model in RETENTION_MODELS:
+        if batches_left <= 0:
+            pending = True
+            break
+        count, has_more = purge_table(db, model, cutoff, batch_size, archive_dir, batches_left)
+        if count:
+            removed[model.__tablename__] = count
+        if has_more:
+            pending = True
+            break
+        batches_left -= math.ceil(count / batch_size)
+    if removed:
+        log_event(
+            logger,
+            logging.INFO,
+            "retention_purged",
+            cutoff=cutoff.isoformat(),
+            archived=archive_dir is not None,
+            pending=pending,
+            **removed,
+        )
+    return removed, pending
@@ -1,19 +1,19 @@
 from __future__ import annotations
 
 import logging
-import re
 import time
 from datetime import UTC, date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
-import arxiv
 from croniter import croniter
+from prometheus_client import start_http_server
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.security import build_fernet, decrypt_text
 from app.core.settings import settings
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, engine, pool_status
 from app.models.models import (
     GitHubAccount,
     GitHubRepository,
@@ -25,30 +25,141 @@ from app.models.models import (
     LeetCodeSchedule,
     LeetCodeScheduleRun,
     LinkedinAccount,
+    LLMCall,
     Schedule,
     ScheduleRun,
     User,
 )
+from packages.arxiv_reciver.src.prompt_builder import build_article_prompt
+from packages.arxiv_reciver.src.schema import ArxivArticle
 from packages.Escritor import gerar_post
-from packages.Linkedin.src.postLinkedin import postar_no_linkedin
+from packages.Linkedin.src.postLinkedin import LinkedInPostError, LinkedInRateLimited, postar_no_linkedin
 from packages.leetcode_automation.pipeline import LeetCodePipelineInput, execute_leetcode_pipeline
-from packages.shared import configure_logging, log_event
+from packages.shared import (
+    LLM_SCHEDULER,
+    LLMCallCollector,
+    LLMCallRecord,
+    TenantBudgetExceeded,
+    Tracer,
+    configure_logging,
+    log_event,
+    resolve_tenant,
+    span,
+)
+from packages.shared.metrics import (
+    JOB_CLAIM_DELAY_SECONDS,
+    JOB_DURATION_SECONDS,
+    JOB_RETRIES_TOTAL,
+    QUEUE_DEPTH,
+    observe_external_call,
+)
+from worker.app.article_cache import (
+    article_key,
+    content_hash,
+    extract_arxiv_id,
+    get_article_by_id,
+    get_topic_articles,
+    NoUnusedArticle,
+    mark_article_used,
+    select_unused_article,
+)
+from worker.app.log_sink import JobLogSink
+from worker.app.prefetch import start_prefetch_thread
+from worker.app.retention import run_retention
 
 
 logger = logging.getLogger("autofeedr.worker")
-ARXIV_URL_PATTERN = re.compile(r"arxiv\.org/(abs|pdf)/([0-9]{4}\.[0-9]{4,5})(v[0-9]+)?")
+QUEUE_STATUSES = ("pending", "retry", "running")
+JOB_LOG_SINK = JobLogSink(
+    engine,
+    batch_size=settings.job_log_batch_size,
+    flush_seconds=settings.job_log_flush_seconds,
+)
 
 
 def _db_session() -> Session:
     return SessionLocal()
 
 
-def _log_job(db: Session, job_id: int, level: str, message: str) -> None:
-    db.add(JobLog(job_id=job_id, level=level, message=message))
+def _log_job(job_id: int, level: str, message: str) -> None:
+    JOB_LOG_SINK.add(JobLog, job_id, level, message)
+
+
+def _log_leetcode_job(job_id: int, level: str, message: str) -> None:
+    JOB_LOG_SINK.add(LeetCodeJobLog, job_id, level, message)
+
+
+def _save_llm_calls(
+    db: Session,
+    job_type: str,
+    job_id: int,
+    owner_user_id: int | None,
+    calls: list[LLMCallRecord],
+) -> None:
+    for call in calls:
+        db.add(
+            LLMCall(
+                owner_user_id=owner_user_id,
+                job_type=job_type,
+                job_id=job_id,
+                stage=call.stage,
+                provider=call.provider,
+                model=call.model,
+                prompt_tokens=call.prompt_tokens,
+                completion_tokens=call.completion_tokens,
+                cached_tokens=call.cached_tokens,
+                cache_hit=call.cached_tokens > 0,
+                latency_ms=call.latency_ms,
+                success=call.success,
+                error_message=call.error,
+            )
+        )
+
+
+def _late_llm_calls_saver(job_type: str, job_id: int, owner_user_id: int | None):
+    """Grava numa sessao propria os registros que chegam depois do fim do job."""
+
+    def _save(calls: list[LLMCallRecord]) -> None:
+        try:
+            with SessionLocal() as db:
+                _save_llm_calls(db, job_type, job_id, owner_user_id, calls)
+                db.commit()
+        except Exception as exc:
+            log_event(
+                logger,
+                logging.WARNING,
+                "llm_call_late_save_failed",
+                job_type=job_type,
+                job_id=job_id,
+                error=str(exc),
+            )
+
+    return _save
+
+
+def _update_queue_depth(db: Session) -> None:
+    for queue, model in (("linkedin", Job), ("leetcode", LeetCodeJob)):
+        counts = dict(
+            db.query(model.status, func.count(model.id))
+            .filter(model.status.in_(QUEUE_STATUSES))
+            .group_by(model.status)
+            .all()
+        )
+        for status in QUEUE_STATUSES:
+            QUEUE_DEPTH.labels(queue=queue, status=status).set(counts.get(status, 0))
+
+
+def _observe_claim(queue: str, scheduled_for: datetime | None) -> float:
+    if scheduled_for is not None:
+        delay = (datetime.now(UTC).replace(tzinfo=None) - scheduled_for).total_seconds()
+        JOB_CLAIM_DELAY_SECONDS.labels(queue=queue).observe(max(0.0, delay))
+    return time.perf_counter()
 
 
-def _log_leetcode_job(db: Session, job_id: int, level: str, message: str) -> None:
-    db.add(LeetCodeJobLog(job_id=job_id, level=level, message=message))
+def _observe_job_done(queue: str, started: float, status: str) -> None:
+    JOB_DURATION_SECONDS.labels(queue=queue, outcome=status).observe(time.perf_counter() - started)
+    if status == "retry":
+        JOB_RETRIES_TOTAL.labels(queue=queue).inc()
 
 
 def _should_run_schedule(cron_expr: str, local_now: datetime) -> bool:
@@ -201,50 +312,39 @@ def _enqueue_due_leetcode_schedules(db: Session) -> int:
     return created
 
 
-def _extract_arxiv_id(url: str) -> str | None:
-    match = ARXIV_URL_PATTERN.search(url)
-    if not match:
-        return None
-    return match.group(2)
+def _paper_info_from_url(url: str) -> tuple[str, ArxivArticle | None]:
+    arxiv_id = extract_arxiv_id(url)
+    if not arxiv_id:
+        return f"Paper URL fornecida: {url}", None
 
+    article = get_article_by_id(arxiv_id)
+    if not article:
+        return f"Paper URL fornecida: {url}", None
 
-def _paper_info_from_url(url: str) -> str:
-    arxiv_id = _extract_arxiv_id(url)
-    if not arxiv_id:
-        return f"Paper URL fornecida: {url}"
-
-    search = arxiv.Search(id_list=[arxiv_id], max_results=1)
-    result = next(arxiv.Client().results(search), None)
-    if not result:
-        return f"Paper URL fornecida: {url}"
-
-    return (
-        f"Title: {result.title}\n"
-        f"Authors: {', '.join(author.name for author in result.authors)}\n"
-        f"Summary: {result.summary}\n"
-        f"URL: {result.entry_id}\n"
-    )
+    return build_article_prompt([article], settings.arxiv_prompt_token_budget), article
 
 
-def _build_content_input(job: Job) -> str:
+def _build_content_input(db: Session, job: Job) -> tuple[str, ArxivArticle | None]:
+    """Texto de entrada do post e o artigo do arXiv usado, se houver, para registrar apos publicar."""
     if job.paper_text:
-        return job.paper_text
+        return job.paper_text, None
 
     if job.paper_url:
         return _paper_info_from_url(job.paper_url)
 
     if job.topic:
-        from packages.arxiv_reciver.main import get_article
-
-        articles = get_article(
-            topics=[job.topic],
-            per_topic=1,
-            save_in_file=False,
+        # Janela ancorada no horario agendado, a mesma que o prefetch aqueceu para este disparo.
+        topic_articles = get_topic_articles(
+            job.topic,
+            max_results=settings.arxiv_candidate_window,
+            reference=job.scheduled_for.replace(tzinfo=UTC),
         )
-        topic_articles = articles.get(job.topic, [])
         if not topic_articles:
             raise RuntimeError(f"Nenhum artigo encontrado para o topico '{job.topic}'.")
-        return str(topic_articles)
+        article = select_unused_article(db, job.account_id, topic_articles)
+        if not article:
+            raise NoUnusedArticle(f"Todos os artigos recentes do topico '{job.topic}' ja foram publicados por esta conta.")
+        return build_article_prompt([article], settings.arxiv_prompt_token_budget), article
 
     raise RuntimeError("Job sem origem de conteudo (topic/paper_url/paper_text).")
 
@@ -255,7 +355,7 @@ def _normalize_urn(urn: str) -> str:
     return f"urn:li:person:{urn}"
 
 
-def _process_job(db: Session, job: Job) -> None:
+def _process_job(db: Session, job: Job, llm_calls: list[LLMCallRecord]) -> None:
     fernet = build_fernet(settings.token_encryption_key)
     account = db.query(LinkedinAccount).filter(LinkedinAccount.id == job.account_id).first()
     if not account or not account.is_active:
@@ -267,23 +367,45 @@ def _process_job(db: Session, job: Job) -> None:
     if not owner or not owner.openai_api_key_encrypted:
         raise RuntimeError("Usuario sem OPENAI_API_KEY cadastrada na aplicacao.")
     user_openai_api_key = decrypt_text(fernet, owner.openai_api_key_encrypted)
-
     token = decrypt_text(fernet, account.token_encrypted)
-    content_input = _build_content_input(job)
-    post_text = gerar_post(
-        content_input,
-        prompt_generation=account.prompt_generation,
-        prompt_translation=account.prompt_translation,
-        openai_api_key=user_openai_api_key,
-    )
-    if not post_text:
-        raise RuntimeError("Falha ao gerar post com IA.")
 
-    posted = postar_no_linkedin(token, _normalize_urn(account.urn), post_text)
+    # Post gerado numa tentativa anterior que falhou so na publicacao: reaproveita o texto e o
+    # artigo de origem guardados, sem buscar conteudo nem consultar o orcamento de IA.
+    post_text = job.generated_post
+    if not post_text:
+        LLM_SCHEDULER.ensure_budget(resolve_tenant(user_openai_api_key))
+        with span("build_content_input"):
+            content_input, article = _build_content_input(db, job)
+        with span("gerar_post"):
+            post_text = gerar_post(
+                content_input,
+                prompt_generation=account.prompt_generation,
+                prompt_translation=account.prompt_translation,
+                openai_api_key=user_openai_api_key,
+                on_llm_call=llm_calls.append,
+            )
+        if not post_text:
+            raise RuntimeError("Falha ao gerar post com IA.")
+        job.generated_post = post_text
+        job.source_arxiv_id = article_key(article) if article else None
+        job.source_content_hash = content_hash(article) if article else None
+
+    with span("postar_no_linkedin"), observe_external_call("linkedin", "post"):
+        posted = postar_no_linkedin(token, _normalize_urn(account.urn), post_text)
     if not posted:
         raise RuntimeError("LinkedIn retornou falha na publicacao.")
 
-    job.generated_post = post_text
+    if job.source_arxiv_id:
+        mark_article_used(db, job.account_id, job.source_arxiv_id, job.source_content_hash, job_id=job.id)
+
+
+def _defer_job(job: Job | LeetCodeJob, exc: TenantBudgetExceeded | LinkedInRateLimited) -> None:
+    # Adiamento por orcamento de IA ou limite do LinkedIn nao conta como tentativa.
+    retry_at = exc.retry_at.replace(tzinfo=None)
+    job.status = "retry"
+    job.scheduled_for = retry_at
+    job.next_retry_at = retry_at
+    job.error_message = str(exc)
 
 
 def _process_pending_jobs(db: Session) -> int:
@@ -298,23 +420,50 @@ def _process_pending_jobs(db: Session) -> int:
     processed = 0
 
     for job in pending:
+        owner_user_id = job.account.owner_user_id
+        started = _observe_claim("linkedin", job.scheduled_for)
         job.status = "running"
         job.updated_at = datetime.utcnow()
         db.flush()
+        llm_calls: list[LLMCallRecord] = []
+        tracer = Tracer("linkedin_job", profile=bool(job.profile_enabled), job_id=job.id)
 
         try:
-            _process_job(db, job)
+            with tracer.activate():
+                _process_job(db, job, llm_calls)
             job.status = "success"
             job.error_message = None
-            _log_job(db, job.id, "INFO", "Publicacao concluida com sucesso.")
+            _log_job(job.id, "INFO", "Publicacao concluida com sucesso.")
             log_event(logger, logging.INFO, "job_success", job_id=job.id, account_id=job.account_id)
+        except TenantBudgetExceeded as exc:
+            _defer_job(job, exc)
+            _log_job(job.id, "WARNING", str(exc))
+            log_event(
+                logger,
+                logging.WARNING,
+                "job_deferred_budget",
+                job_id=job.id,
+                account_id=job.account_id,
+                retry_at=exc.retry_at.isoformat(timespec="seconds"),
+            )
+        except LinkedInRateLimited as exc:
+            _defer_job(job, exc)
+            _log_job(job.id, "WARNING", str(exc))
+            log_event(
+                logger,
+                logging.WARNING,
+                "job_deferred_linkedin_rate_limit",
+                job_id=job.id,
+                account_id=job.account_id,
+                retry_at=exc.retry_at.isoformat(timespec="seconds"),
+            )
         except Exception as exc:
             if str(exc).startswith("PIPELINE_ATTEMPTS_EXHAUSTED"):
                 job.attempts = job.max_attempts
                 job.status = "failed"
                 job.next_retry_at = None
                 job.error_message = str(exc)
-                _log_leetcode_job(db, job.id, "ERROR", f"Falha final de qualidade: {exc}")
+                _log_job(job.id, "ERROR", f"Falha final de qualidade: {exc}")
                 log_event(
                     logger,
                     logging.ERROR,
@@ -326,12 +475,47 @@ def _process_pending_jobs(db: Session) -> int:
                 processed += 1
                 continue
 
+            if isinstance(exc, LinkedInPostError) and exc.permanent:
+                # Token expirado, conteudo duplicado etc.: repetir so gastaria tentativas.
+                job.attempts += 1
+                job.status = "failed"
+                job.next_retry_at = None
+                job.error_message = str(exc)
+                _log_job(job.id, "ERROR", f"Falha permanente do LinkedIn: {exc}")
+                log_event(
+                    logger,
+                    logging.ERROR,
+                    "job_failed_permanent",
+                    job_id=job.id,
+                    account_id=job.account_id,
+                    status_code=exc.status_code,
+                    error=str(exc),
+                )
+                continue
+
+            if isinstance(exc, NoUnusedArticle):
+                # Nada novo para publicar: o proximo disparo do agendamento tenta de novo com outra janela.
+                job.attempts += 1
+                job.status = "failed"
+                job.next_retry_at = None
+                job.error_message = str(exc)
+                _log_job(job.id, "WARNING", f"Sem artigo novo: {exc}")
+                log_event(
+                    logger,
+                    logging.WARNING,
+                    "job_skipped_no_new_article",
+                    job_id=job.id,
+                    account_id=job.account_id,
+                    topic=job.topic,
+                )
+                continue
+
             job.attempts += 1
             job.error_message = str(exc)
             if job.attempts >= job.max_attempts:
                 job.status = "failed"
                 job.next_retry_at = None
-                _log_job(db, job.id, "ERROR", f"Falha final: {exc}")
+                _log_job(job.id, "ERROR", f"Falha final: {exc}")
                 log_event(
                     logger,
                     logging.ERROR,
@@ -344,10 +528,12 @@ def _process_pending_jobs(db: Session) -> int:
             else:
                 retry_delay = timedelta(minutes=2 * job.attempts)
                 retry_at = datetime.now(UTC) + retry_delay
+                if isinstance(exc, LinkedInPostError) and exc.retry_at:
+                    retry_at = max(retry_at, exc.retry_at)
                 job.status = "retry"
                 job.scheduled_for = retry_at.replace(tzinfo=None)
                 job.next_retry_at = retry_at.replace(tzinfo=None)
-                _log_job(db, job.id, "WARNING", f"Falha tentativa {job.attempts}: {exc}")
+                _log_job(job.id, "WARNING", f"Falha tentativa {job.attempts}: {exc}")
                 log_event(
                     logger,
                     logging.WARNING,
@@ -359,13 +545,18 @@ def _process_pending_jobs(db: Session) -> int:
                     error=str(exc),
                 )
         finally:
+            if llm_calls:
+                _save_llm_calls(db, "linkedin", job.id, owner_user_id, llm_calls)
+            job.trace_json = tracer.to_json()
+            JOB_LOG_SINK.flush()
+            _observe_job_done("linkedin", started, job.status)
             processed += 1
 
     db.commit()
     return processed
 
 
-def _process_single_leetcode_job(db: Session, job: LeetCodeJob) -> None:
+def _process_single_leetcode_job(db: Session, job: LeetCodeJob, llm_calls: LLMCallCollector) -> None:
     repository = db.query(GitHubRepository).filter(GitHubRepository.id == job.repository_id).first()
     if not repository or not repository.is_active:
         raise RuntimeError("Repositorio GitHub inexistente ou inativo.")
@@ -388,6 +579,7 @@ def _process_single_leetcode_job(db: Session, job: LeetCodeJob) -> None:
                 user_openai_api_key = decrypt_text(fernet, owner.openai_api_key_encrypted)
     if not user_openai_api_key:
         raise RuntimeError("Usuario sem OPENAI_API_KEY cadastrada na aplicacao.")
+    LLM_SCHEDULER.ensure_budget(resolve_tenant(user_openai_api_key))
 
     ssh_private_key = decrypt_text(fernet, account.ssh_key_encrypted)
     ssh_passphrase = (
@@ -422,6 +614,9 @@ def _process_single_leetcode_job(db: Session, job: LeetCodeJob) -> None:
         tmp_root=settings.worker_tmp_dir,
         solution_prompt_template=user_prompt,
         openai_api_key=user_openai_api_key,
+        parallel_generation=settings.leetcode_parallel_generation,
+        solution_candidates=settings.leetcode_solution_candidates,
+        on_llm_call=llm_calls.append,
     )
 
     result = execute_leetcode_pipeline(payload)
@@ -459,16 +654,24 @@ def _process_pending_leetcode_jobs(db: Session) -> int:
     processed = 0
 
     for job in pending:
+        job_id = job.id
+        owner_user_id = job.repository.owner_user_id
+        started = _observe_claim("leetcode", job.scheduled_for)
+        refreshed_ok = True
         job.status = "running"
         job.updated_at = datetime.utcnow()
         db.flush()
+        # Candidatas canceladas podem registrar uso depois do fim do job; o coletor grava essas a parte.
+        llm_calls = LLMCallCollector(_late_llm_calls_saver("leetcode", job_id, owner_user_id))
+        tracer = Tracer("leetcode_job", profile=bool(job.profile_enabled), job_id=job_id)
 
         try:
-            _log_leetcode_job(db, job.id, "INFO", "Iniciando pipeline LeetCode -> GitHub.")
-            _process_single_leetcode_job(db, job)
+            _log_leetcode_job(job.id, "INFO", "Iniciando pipeline LeetCode -> GitHub.")
+            with tracer.activate():
+                _process_single_leetcode_job(db, job, llm_calls)
             job.status = "success"
             job.error_message = None
-            _log_leetcode_job(db, job.id, "INFO", "Pipeline concluido com sucesso.")
+            _log_leetcode_job(job.id, "INFO", "Pipeline concluido com sucesso.")
             log_event(
                 logger,
                 logging.INFO,
@@ -478,16 +681,28 @@ def _process_pending_leetcode_jobs(db: Session) -> int:
                 problem_id=job.problem_frontend_id,
                 commit_sha=job.commit_sha,
             )
+        except TenantBudgetExceeded as exc:
+            _defer_job(job, exc)
+            _log_leetcode_job(job.id, "WARNING", str(exc))
+            log_event(
+                logger,
+                logging.WARNING,
+                "leetcode_job_deferred_budget",
+                job_id=job.id,
+                repository_id=job.repository_id,
+                retry_at=exc.retry_at.isoformat(timespec="seconds"),
+            )
         except IntegrityError as exc:
             db.rollback()
             refreshed = db.query(LeetCodeJob).filter(LeetCodeJob.id == job.id).first()
             if not refreshed:
+                refreshed_ok = False
                 continue
             refreshed.attempts += 1
             refreshed.error_message = f"Falha de deduplicacao/consistencia: {exc}"
             refreshed.status = "failed"
             refreshed.next_retry_at = None
-            _log_leetcode_job(db, refreshed.id, "ERROR", refreshed.error_message)
+            _log_leetcode_job(refreshed.id, "ERROR", refreshed.error_message)
             log_event(
                 logger,
                 logging.ERROR,
@@ -502,7 +717,7 @@ def _process_pending_leetcode_jobs(db: Session) -> int:
             if job.attempts >= job.max_attempts:
                 job.status = "failed"
                 job.next_retry_at = None
-                _log_leetcode_job(db, job.id, "ERROR", f"Falha final: {exc}")
+                _log_leetcode_job(job.id, "ERROR", f"Falha final: {exc}")
                 log_event(
                     logger,
                     logging.ERROR,
@@ -518,7 +733,7 @@ def _process_pending_leetcode_jobs(db: Session) -> int:
                 job.status = "retry"
                 job.scheduled_for = retry_at.replace(tzinfo=None)
                 job.next_retry_at = retry_at.replace(tzinfo=None)
-                _log_leetcode_job(db, job.id, "WARNING", f"Falha tentativa {job.attempts}: {exc}")
+                _log_leetcode_job(job.id, "WARNING", f"Falha tentativa {job.attempts}: {exc}")
                 log_event(
                     logger,
                     logging.WARNING,
@@ -530,6 +745,13 @@ def _process_pending_leetcode_jobs(db: Session) -> int:
                     error=str(exc),
                 )
         finally:
+            leetcode_calls = llm_calls.drain()
+            if leetcode_calls:
+                _save_llm_calls(db, "leetcode", job_id, owner_user_id, leetcode_calls)
+            if refreshed_ok:
+                job.trace_json = tracer.to_json()
+            JOB_LOG_SINK.flush()
+            _observe_job_done("leetcode", started, job.status if refreshed_ok else "failed")
             processed += 1
 
     db.commit()
@@ -539,14 +761,36 @@ def _process_pending_leetcode_jobs(db: Session) -> int:
 def run_worker_loop() -> None:
     global logger
     logger = configure_logging("autofeedr.worker")
+    if settings.worker_metrics_port:
+        start_http_server(settings.worker_metrics_port)
+    LLM_SCHEDULER.configure(
+        max_concurrent=settings.llm_max_concurrent_per_tenant,
+        tokens_per_minute=settings.llm_tokens_per_minute_per_tenant,
+    )
     log_event(
         logger,
         logging.INFO,
         "worker_start",
         poll_seconds=settings.worker_poll_seconds,
         default_timezone=settings.default_timezone,
+        llm_max_concurrent_per_tenant=settings.llm_max_concurrent_per_tenant,
+        llm_tokens_per_minute_per_tenant=settings.llm_tokens_per_minute_per_tenant,
+        db_pool_size=settings.db_pool_size,
+        db_pool_pre_ping=settings.db_pool_pre_ping,
+        arxiv_prefetch_horizon_minutes=settings.arxiv_prefetch_horizon_minutes,
     )
+    if settings.leetcode_solution_candidates > 1 and not settings.leetcode_parallel_generation:
+        log_event(
+            logger,
+            logging.WARNING,
+            "leetcode_solution_candidates_ignored",
+            solution_candidates=settings.leetcode_solution_candidates,
+            reason="LEETCODE_SOLUTION_CANDIDATES so vale com LEETCODE_PARALLEL_GENERATION=true",
+        )
+    start_prefetch_thread()
 
+    last_pool_log = time.monotonic()
+    last_retention: float | None = None
     while True:
         db = _db_session()
         try:
@@ -565,12 +809,27 @@ def run_worker_loop() -> None:
             processed_leetcode = _process_pending_leetcode_jobs(db)
             if processed_leetcode:
                 log_event(logger, logging.INFO, "leetcode_jobs_processed", count=processed_leetcode)
+
+            _update_queue_depth(db)
+
+            retention_due = last_retention is None or (
+                time.monotonic() - last_retention >= settings.retention_interval_minutes * 60
+            )
+            if settings.retention_days > 0 and retention_due:
+                _, retention_pending = run_retention(db)
+                # Backlog grande e drenado em rodadas limitadas, uma por ciclo, sem travar os jobs.
+                last_retention = None if retention_pending else time.monotonic()
         except Exception as exc:
             db.rollback()
             log_event(logger, logging.ERROR, "worker_cycle_failed", error=str(exc))
         finally:
+            JOB_LOG_SINK.flush()
             db.close()
 
+        if settings.db_pool_log_seconds > 0 and time.monotonic() - last_pool_log >= settings.db_pool_log_seconds:
+            last_pool_log = time.monotonic()
+            log_event(logger, logging.INFO, "db_pool_status", **pool_status(engine))
+
         time.sleep(settings.worker_poll_seconds)
 
 